@@ -1,7 +1,32 @@
-from typing import List, Dict, Any
+import ctypes
+import threading
+import time
+from collections import Counter
+from typing import List, Dict, Any, Optional, Set, Tuple
 
 from utils import log
 
+# After a runtime NVML failure, GPU queries are skipped for
+# NVML_BACKOFF_BASE * 2**streak seconds, capped at NVML_BACKOFF_MAX.
+NVML_BACKOFF_BASE = 15.0
+NVML_BACKOFF_MAX = 300.0
+
+# NVML error codes after which the GPU won't come back without a restart
+# (driver unloaded or upgraded underneath us, GPU fallen off the bus). Other
+# errors are treated as transient and only back off.
+FATAL_NVML_ERRORS = (
+    "NVML_ERROR_GPU_IS_LOST",
+    "NVML_ERROR_DRIVER_NOT_LOADED",
+    "NVML_ERROR_LIB_RM_VERSION_MISMATCH",
+    "NVML_ERROR_UNINITIALIZED",
+)
+
+# Process listings queried on top of nvmlDeviceGetComputeRunningProcesses
+OPTIONAL_PROCESS_QUERIES = (
+    "nvmlDeviceGetGraphicsRunningProcesses",
+    "nvmlDeviceGetMPSComputeRunningProcesses",
+)
+
 # The 'nvidia-ml-py' package provides the 'pynvml' module.
 # This is a try-except block to ensure the application runs
 # even if the NVIDIA driver/library is not installed.
@@ -13,12 +38,46 @@ except ImportError:
     pynvml = None # Assign None to pynvml if it couldn't be imported
 
 
+class NVMLBackoff:
+    """
+    Tracks consecutive failures of one kind of NVML query and suspends that
+    query for an exponentially growing period after each failure.
+    """
+
+    def __init__(self):
+        self.fail_until: float = 0.0
+        self.fail_streak: int = 0
+
+    def active(self) -> bool:
+        """Whether the query is currently suspended."""
+        return time.monotonic() < self.fail_until
+
+    def record_failure(self) -> float:
+        """
+        Suspends the query after a failure.
+
+        Returns:
+            The length of the suspension in seconds.
+        """
+        self.fail_streak += 1
+        delay = min(NVML_BACKOFF_MAX, NVML_BACKOFF_BASE * 2 ** self.fail_streak)
+        self.fail_until = time.monotonic() + delay
+        return delay
+
+    def record_success(self) -> None:
+        self.fail_streak = 0
+        self.fail_until = 0.0
+
+
 class GPUMonitor:
     """
     A wrapper for fetching NVIDIA GPU stats using the pynvml library.
     Gracefully handles cases where nvidia-ml-py is not installed or no
     NVIDIA GPU/drivers are found.
     """
+    # NVML is a process-wide library, so init and shutdown are serialized
+    # across instances.
+    _nvml_lock = threading.Lock()
 
     def __init__(self):
         """
@@ -26,79 +85,235 @@ class GPUMonitor:
         library and sets an availability flag.
         """
         self.is_available = False
+        # Whether this instance holds an nvmlInit() that still needs a shutdown
+        self._nvml_initialized = False
         self.pid_gpu_memory_map: Dict[int, int] = {}
+        # Device stats from the last refresh()
+        self._gpu_info: List[Dict[str, Any]] = []
+        # Failed NVML calls can block for a long time, so back off after
+        # errors. Device stats and the process listing back off separately so
+        # that a failing process query doesn't also blank the GPU tab.
+        self._info_backoff = NVMLBackoff()
+        self._process_backoff = NVMLBackoff()
+
+        # Static per-device data, queried once after a successful init
+        self._handles: List[Any] = []
+        self._device_info: List[Dict[str, Any]] = []
+        # (device index, query name) pairs the driver reported as unsupported
+        self._unsupported_queries: Set[Tuple[int, str]] = set()
+        # Direct bindings for the per-refresh stats queries, see _bind_stat_queries()
+        self._stat_queries: Optional[Tuple[Any, Any, Any, Any]] = None
 
         if PYNXML_AVAILABLE:
             try:
-                pynvml.nvmlInit()
-                self.is_available = True
-                log.info("nvidia-ml-py (pynvml) initialized successfully. GPU monitoring enabled.")
+                with self._nvml_lock:
+                    pynvml.nvmlInit()
+                    self._nvml_initialized = True
+                self._cache_devices()
+                self._bind_stat_queries()
             except pynvml.NVMLError as e:
                 log.warning(f"Failed to initialize pynvml. GPU monitoring disabled. Error: {e}")
-                self.is_available = False
+                self.shutdown()
+                return
+            if self._handles:
+                self.is_available = True
+                log.info("nvidia-ml-py (pynvml) initialized successfully. GPU monitoring enabled.")
+            else:
+                # Nothing to poll, so release the driver rather than keep it awake
+                log.info("No NVIDIA GPUs found. GPU monitoring disabled.")
+                self.shutdown()
         else:
             log.info("nvidia-ml-py library not found. GPU monitoring is disabled.")
 
-    def _map_pids_to_gpus(self) -> None:
+    def _cache_devices(self) -> None:
         """
-        Creates a fresh map of process PIDs to their GPU memory usage.
-        This is called on each monitoring cycle to get the latest data and is
-        more efficient than querying for each process individually.
+        Fetches the device handles, names and UUIDs once. These never change
+        for the lifetime of the NVML session, so each refresh cycle only has to
+        query the dynamic counters (memory, utilization and processes).
         """
-        if not self.is_available:
+        self._handles = []
+        self._device_info = []
+        for i in range(pynvml.nvmlDeviceGetCount()):
+            handle = pynvml.nvmlDeviceGetHandleByIndex(i)
+            self._handles.append(handle)
+            self._device_info.append({
+                "name": pynvml.nvmlDeviceGetName(handle),
+                "uuid": pynvml.nvmlDeviceGetUUID(handle),
+            })
+
+    def _bind_stat_queries(self) -> None:
+        """
+        Looks up the memory and utilization entry points of the NVML library
+        pynvml loaded, and allocates the structs they fill once. The pynvml
+        wrappers repeat the lookup (under a lock) and allocate a new struct
+        on every call, which adds up at short refresh intervals.
+        Without a loaded library the pynvml wrappers are used instead.
+        """
+        if not isinstance(getattr(pynvml, "nvmlLib", None), ctypes.CDLL):
             return
+        memory = pynvml.c_nvmlMemory_t()
+        utilization = pynvml.c_nvmlUtilization_t()
+        self._stat_buffers = (memory, utilization)
+        self._stat_queries = (
+            pynvml._nvmlGetFunctionPointer("nvmlDeviceGetMemoryInfo"),
+            pynvml._nvmlGetFunctionPointer("nvmlDeviceGetUtilizationRates"),
+            ctypes.byref(memory),
+            ctypes.byref(utilization),
+        )
+
+    def _query_device_stats(self, handle: Any) -> Tuple[int, int, int]:
+        """
+        Returns:
+            A tuple of (total memory, used memory, GPU utilization %) for a device.
+        """
+        if self._stat_queries is None:
+            mem_info = pynvml.nvmlDeviceGetMemoryInfo(handle)
+            util_rates = pynvml.nvmlDeviceGetUtilizationRates(handle)
+            return mem_info.total, mem_info.used, util_rates.gpu
 
-        # Reset map for each refresh cycle
-        self.pid_gpu_memory_map = {}
-        try:
-            device_count = pynvml.nvmlDeviceGetCount()
-            for i in range(device_count):
-                handle = pynvml.nvmlDeviceGetHandleByIndex(i)
-                # nvmlDeviceGetComputeRunningProcesses is generally sufficient
-                procs = pynvml.nvmlDeviceGetComputeRunningProcesses(handle)
-                for p in procs:
+        get_memory, get_utilization, memory_ref, utilization_ref = self._stat_queries
+        ret = get_memory(handle, memory_ref)
+        if ret != pynvml.NVML_SUCCESS:
+            raise pynvml.NVMLError(ret)
+        ret = get_utilization(handle, utilization_ref)
+        if ret != pynvml.NVML_SUCCESS:
+            raise pynvml.NVMLError(ret)
+        # The structs are reused for every device, so copy the values out
+        memory, utilization = self._stat_buffers
+        return memory.total, memory.used, utilization.gpu
+
+    def refresh(self, include_processes: bool = True) -> None:
+        """
+        Queries the current device stats, and optionally the per-process GPU
+        memory, in a single pass over the devices. get_gpu_info() and
+        get_process_gpu_memory() serve the results until the next refresh.
+
+        Args:
+            include_processes: Also rebuild the PID map. It is the most
+                expensive query, so callers may refresh it less often; the
+                previous map is kept otherwise.
+        """
+        gpu_info, memory_map = self._refresh_gpu_state(include_processes)
+        self._gpu_info = gpu_info
+        if memory_map is not None:
+            self.pid_gpu_memory_map = memory_map
+
+    def _refresh_gpu_state(self, include_processes: bool) -> Tuple[List[Dict[str, Any]], Optional[Dict[int, int]]]:
+        """
+        Walks the devices once, collecting the stats of each and the processes
+        using it. Device stats and the process listing still fail and back off
+        independently, so one failing query doesn't blank the other.
+
+        Returns:
+            A tuple of (per-GPU stats, PID -> GPU memory in bytes). The map is
+            None when the PID map was not queried this time.
+        """
+        if not self.is_available:
+            return [], None
+        query_info = not self._info_backoff.active()
+        query_processes = include_processes and not self._process_backoff.active()
+
+        gpu_info_list: List[Dict[str, Any]] = []
+        memory_map = Counter() if query_processes else None
+        for index, (handle, static_info) in enumerate(zip(self._handles, self._device_info)):
+            if query_info:
+                try:
+                    # Two driver calls per device and refresh. nvmlDeviceGetFieldValues
+                    # can't batch them: NVML has no field IDs for memory usage or
+                    # GPU utilization, only for counters such as temperatures.
+                    total_memory, used_memory, utilization = self._query_device_stats(handle)
+                    gpu_info_list.append({
+                        **static_info,
+                        "total_memory": total_memory,
+                        "used_memory": used_memory,
+                        "memory_percent": (used_memory / total_memory * 100) if total_memory > 0 else 0,
+                        "gpu_utilization": utilization,
+                    })
+                except pynvml.NVMLError as e:
+                    if self._handle_query_error(e, self._info_backoff, "Could not retrieve GPU info during update"):
+                        return [], None
+                    query_info = False
+                    gpu_info_list = []
+
+            if query_processes:
+                try:
+                    # usedGpuMemory is None when the driver can't attribute memory (e.g. WDDM)
+                    device_map = {
+                        p.pid: p.usedGpuMemory or 0
+                        for p in pynvml.nvmlDeviceGetComputeRunningProcesses(handle)
+                    }
+                    device_map.update(self._optional_process_memory(index, handle))
                     # A single process can use multiple GPUs, so we aggregate memory
-                    self.pid_gpu_memory_map[p.pid] = self.pid_gpu_memory_map.get(p.pid, 0) + p.usedGpuMemory
-        except pynvml.NVMLError as e:
-            # This can happen if drivers are updated, system sleeps, etc.
-            log.error(f"Error fetching GPU process info: {e}")
-            self.pid_gpu_memory_map = {}
+                    memory_map.update(device_map)
+                except pynvml.NVMLError as e:
+                    # This can happen if drivers are updated, system sleeps, etc.
+                    if self._handle_query_error(e, self._process_backoff, "Error fetching GPU process info"):
+                        return [], None
+                    query_processes = False
+                    memory_map = Counter()
 
+        if query_info:
+            self._info_backoff.record_success()
+        if query_processes:
+            self._process_backoff.record_success()
+        return gpu_info_list, memory_map
+
+    def _optional_process_memory(self, index: int, handle: Any) -> Dict[int, int]:
+        """
+        Collects processes that the compute query doesn't report: graphics
+        contexts (games, compositors) and MPS clients. A process may appear in
+        several lists, so the result holds one entry per PID for this device.
+
+        These queries are unsupported on some drivers and devices. Their
+        failures are ignored so they never cost the compute results, and a
+        query that is unsupported is not retried for that device.
+        """
+        device_map: Dict[int, int] = {}
+        for query_name in OPTIONAL_PROCESS_QUERIES:
+            if (index, query_name) in self._unsupported_queries:
+                continue
+            try:
+                procs = getattr(pynvml, query_name)(handle)
+            except pynvml.NVMLError as e:
+                if e.value in (pynvml.NVML_ERROR_NOT_SUPPORTED, pynvml.NVML_ERROR_FUNCTION_NOT_FOUND):
+                    self._unsupported_queries.add((index, query_name))
+                    log.info(f"{query_name} is not supported on GPU {index}.")
+                continue
+            for p in procs:
+                device_map[p.pid] = p.usedGpuMemory or 0
+        return device_map
 
     def get_gpu_info(self) -> List[Dict[str, Any]]:
         """
-        Retrieves detailed information for each available NVIDIA GPU.
+        Retrieves detailed information for each available NVIDIA GPU, as of
+        the last refresh().
 
         Returns:
             A list of dictionaries, where each dictionary represents a GPU's stats.
             Returns an empty list if GPU monitoring is not available.
         """
-        if not self.is_available:
-            return []
-
-        gpu_info_list = []
-        try:
-            device_count = pynvml.nvmlDeviceGetCount()
-            for i in range(device_count):
-                handle = pynvml.nvmlDeviceGetHandleByIndex(i)
-                gpu_name = pynvml.nvmlDeviceGetName(handle)
-                mem_info = pynvml.nvmlDeviceGetMemoryInfo(handle)
-                util_rates = pynvml.nvmlDeviceGetUtilizationRates(handle)
-
-                gpu_info_list.append({
-                    "name": gpu_name,
-                    "uuid": pynvml.nvmlDeviceGetUUID(handle),
-                    "total_memory": mem_info.total,
-                    "used_memory": mem_info.used,
-                    "memory_percent": (mem_info.used / mem_info.total * 100) if mem_info.total > 0 else 0,
-                    "gpu_utilization": util_rates.gpu,
-                })
-        except pynvml.NVMLError as e:
-            log.error(f"Could not retrieve GPU info during update. Disabling monitoring. Error: {e}")
-            self.is_available = False # Disable if a runtime error occurs
-            return []
-        
-        return gpu_info_list
+        return self._gpu_info
+
+    def _handle_query_error(self, error: Exception, backoff: NVMLBackoff, message: str) -> bool:
+        """
+        Disables monitoring after a fatal error, or backs the query off otherwise.
+
+        Returns:
+            True if monitoring was disabled.
+        """
+        if self._is_fatal(error):
+            log.error(f"GPU is no longer reachable. GPU monitoring disabled. Error: {error}")
+            self.shutdown()
+            return True
+        delay = backoff.record_failure()
+        log.error(f"{message}. Retrying in {delay:.0f}s. Error: {error}")
+        return False
+
+    @staticmethod
+    def _is_fatal(error: Exception) -> bool:
+        """Whether an NVML error means the GPU is gone for the rest of the session."""
+        value = getattr(error, "value", None)
+        return any(value == getattr(pynvml, name, None) for name in FATAL_NVML_ERRORS)
 
     def get_process_gpu_memory(self, pid: int) -> int:
         """
@@ -114,9 +329,17 @@ class GPUMonitor:
 
     def shutdown(self):
         """
-        Properly shuts down the pynvml library when the application closes.
+        Properly shuts down the pynvml library when the application closes,
+        or when GPU monitoring is disabled at runtime. Safe to call repeatedly.
         """
-        if self.is_available:
+        with self._nvml_lock:
+            self.is_available = False
+            self.pid_gpu_memory_map = {}
+            self._gpu_info = []
+            self._stat_queries = None
+            if not self._nvml_initialized:
+                return
+            self._nvml_initialized = False
             try:
                 pynvml.nvmlShutdown()
                 log.info("pynvml shut down successfully.")
@@ -1,103 +1,286 @@
+import os
+import threading
 import time
-from typing import Dict, Any, List
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional
+import numpy as np
 import psutil
-from PySide6.QtCore import QObject, Signal, QMutex
 
 from gpu_monitor import GPUMonitor
+from process_scanner import LazyCommand, ProcessScanner, PROCFS_AVAILABLE
 from utils import log
 
-class SystemMonitor(QObject):
+# The per-process GPU memory walk is the most expensive NVML query, so it runs
+# only every this many refreshes; device stats still update every refresh.
+GPU_PROCESS_REFRESH_FACTOR = 3
+
+# When the readings stay this close for QUIET_TICKS_BEFORE_SLOWDOWN refreshes
+# in a row, the refresh interval doubles with each further quiet refresh, up
+# to MAX_REFRESH_INTERVAL seconds. Any change restores the base interval.
+QUIET_TICKS_BEFORE_SLOWDOWN = 3
+MAX_REFRESH_INTERVAL = 30.0
+QUIET_CPU_DELTA = 2.0      # percentage points of total CPU
+QUIET_RAM_DELTA = 1.0      # percentage points of RAM
+QUIET_GPU_DELTA = 2.0      # percentage points of utilization, per GPU
+
+# /proc/stat is re-read from offset 0 each refresh; the per-core lines come
+# right after the aggregate line, and this many bytes per core covers them.
+CPU_STAT_BYTES_PER_CORE = 256
+
+@dataclass(frozen=True)
+class TickData:
+    """
+    One refresh worth of system metrics, handed from the monitor thread to the UI.
+    Slotted rather than a nested dict: it is built on every refresh and its
+    fields are read many times while redrawing.
+    """
+    __slots__ = ('cpu_total', 'cpu_per_core', 'physical_cores', 'logical_cores',
+                 'ram_total', 'ram_used', 'ram_percent', 'gpu',
+                 'processes', 'process_names', 'process_commands')
+    cpu_total: float
+    cpu_per_core: np.ndarray
+    physical_cores: Optional[int]
+    logical_cores: Optional[int]
+    ram_total: int
+    ram_used: int
+    ram_percent: float
+    gpu: List[Dict[str, Any]]
+    # A PROCESS_DTYPE structured array, with names and commands aligned to it
+    processes: np.ndarray
+    process_names: List[str]
+    process_commands: List[LazyCommand]
+
+
+class SystemMonitor:
     """
-    A worker QObject that runs in a separate thread to monitor system resources.
-    It periodically collects data and emits a signal with the results.
+    Monitors system resources on a background thread.
+    Each refresh replaces the latest snapshot, which the UI collects with
+    take_latest(). Snapshots the UI didn't get to are simply dropped, so a
+    slow redraw never builds up a backlog of stale updates.
     """
-    # Signal to emit data: dict contains all system information
-    data_updated = Signal(dict)
 
     def __init__(self, refresh_interval: float = 1.5):
-        super().__init__()
         self._refresh_interval = refresh_interval
-        self._is_running = True
-        self._mutex = QMutex()
+        self._thread: Optional[threading.Thread] = None
+        # The most recent snapshot not yet taken by the UI
+        self._latest: Optional[TickData] = None
+        self._latest_lock = threading.Lock()
+        # Set by stop(); waiting on it instead of sleeping lets stop() wake
+        # the loop immediately
+        self._stop_event = threading.Event()
+        # Set by stop() and request_refresh() to cut the current wait short
+        self._wake_event = threading.Event()
+
+        # Adaptive cadence: the interval actually waited and the readings it
+        # is judged by
+        self._effective_interval = refresh_interval
+        self._quiet_ticks = 0
+        self._last_summary: Optional[tuple] = None
 
         self.gpu_monitor = GPUMonitor()
-        
-        # For CPU percentage calculation
-        self._last_cpu_times = psutil.cpu_times(percpu=True)
+        self.process_scanner = ProcessScanner()
+        self._gpu_slow_interval = refresh_interval * GPU_PROCESS_REFRESH_FACTOR
+        self._next_slow_at = 0.0
+
+        # For CPU percentage calculation. /proc/stat stays open so each
+        # refresh costs one pread() instead of an open/read/close.
+        self._stat_fd: Optional[int] = None
+        if PROCFS_AVAILABLE:
+            self._stat_fd = os.open("/proc/stat", os.O_RDONLY)
+            self._stat_read_size = CPU_STAT_BYTES_PER_CORE * ((os.cpu_count() or 1) + 1)
+        self._last_cpu_times = self._read_cpu_times()
+        # Core counts are reported every refresh but only change with CPU
+        # hotplug; the physical count is read from sysfs, so query both once.
+        self._physical_cores = psutil.cpu_count(logical=False)
+        self._logical_cores = psutil.cpu_count(logical=True)
 
     def run(self):
         """The main monitoring loop."""
         log.info("System monitor thread started.")
-        while self._is_running:
-            start_time = time.time()
-            
-            # Update GPU process map before fetching process list
-            self.gpu_monitor._map_pids_to_gpus()
+        deadline = time.monotonic()
+        while not self._stop_event.is_set():
+            start_time = time.monotonic()
+
+            # Refresh the GPU stats before fetching the process list, which
+            # reads the PID map. Between coarse ticks the previous map is reused.
+            slow_tick = start_time >= self._next_slow_at
+            if slow_tick:
+                self._next_slow_at = start_time + self._gpu_slow_interval
+            self.gpu_monitor.refresh(include_processes=slow_tick)
 
             system_data = self._collect_data()
-            if self._is_running:
-                self.data_updated.emit(system_data)
-
-            # Ensure the loop runs at the desired refresh interval
-            elapsed_time = time.time() - start_time
-            sleep_time = self._refresh_interval - elapsed_time
-            if sleep_time > 0:
-                time.sleep(sleep_time)
-        
-        self.gpu_monitor.shutdown()
+            with self._latest_lock:
+                self._latest = system_data
+            self._update_cadence(system_data)
+
+            # Refreshes are scheduled on absolute deadlines, so neither the
+            # time spent collecting nor late wakeups make the cadence drift
+            now = time.monotonic()
+            deadline = self._next_deadline(deadline, self._effective_interval, now)
+            # The event is cleared only once the wait has seen it, so a wake
+            # that arrives while collecting is never lost
+            if self._wake_event.wait(deadline - now):
+                # Woken early by request_refresh() or stop(): start a new schedule
+                self._wake_event.clear()
+                deadline = time.monotonic()
+
+        self.close()
         log.info("System monitor thread stopped.")
 
-    def stop(self):
-        """Stops the monitoring loop."""
-        self._mutex.lock()
-        self._is_running = False
-        self._mutex.unlock()
+    @staticmethod
+    def _next_deadline(deadline: float, interval: float, now: float) -> float:
+        """
+        Returns the time of the next refresh, one interval after the previous
+        deadline. A refresh that overran its slot gets the next one right away;
+        the missed slots are dropped rather than run back to back.
+        """
+        deadline += interval
+        return deadline if deadline > now else now
+
+    def start(self):
+        """Starts the monitoring loop on a daemon thread."""
+        self._thread = threading.Thread(target=self.run, name="system-monitor", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        """
+        Stops the monitoring loop, interrupting the wait between refreshes.
+
+        Args:
+            timeout: If given, how long to wait for the monitor thread to exit.
+        """
+        self._stop_event.set()
+        self._wake_event.set()
+        if timeout is not None and self._thread is not None:
+            self._thread.join(timeout)
+
+    def close(self):
+        """
+        Releases /proc/stat, the scanner's reader threads and NVML. Called
+        when the loop exits; a monitor that is never started must be closed
+        by its owner. Safe to call more than once.
+        """
+        self.gpu_monitor.shutdown()
+        self.process_scanner.shutdown()
+        if self._stat_fd is not None:
+            os.close(self._stat_fd)
+            self._stat_fd = None
+
+    def request_refresh(self):
+        """
+        Refreshes right away and returns to the base interval, e.g. after the
+        user acted on a process and expects to see the result.
+        """
+        self._quiet_ticks = 0
+        self._effective_interval = self._refresh_interval
+        self._wake_event.set()
+
+    def _update_cadence(self, data: TickData) -> None:
+        """
+        Slows the refresh down while nothing changes and snaps it back to the
+        base interval on the first material change.
+        """
+        summary = (
+            data.cpu_total,
+            data.ram_percent,
+            len(data.processes),
+            tuple(gpu["gpu_utilization"] for gpu in data.gpu),
+        )
+        last = self._last_summary
+        self._last_summary = summary
+        quiet = (
+            last is not None
+            and abs(summary[0] - last[0]) < QUIET_CPU_DELTA
+            and abs(summary[1] - last[1]) < QUIET_RAM_DELTA
+            and summary[2] == last[2]
+            and len(summary[3]) == len(last[3])
+            and all(abs(a - b) < QUIET_GPU_DELTA for a, b in zip(summary[3], last[3]))
+        )
+        if not quiet:
+            self._quiet_ticks = 0
+            self._effective_interval = self._refresh_interval
+            return
+        self._quiet_ticks += 1
+        if self._quiet_ticks >= QUIET_TICKS_BEFORE_SLOWDOWN:
+            self._effective_interval = min(self._effective_interval * 2, MAX_REFRESH_INTERVAL)
+
+    def take_latest(self) -> Optional[TickData]:
+        """
+        Returns the newest snapshot, or None if there is none since the last call.
+        """
+        with self._latest_lock:
+            data, self._latest = self._latest, None
+        return data
+
+    def _read_cpu_times(self) -> np.ndarray:
+        """
+        Reads the cumulative CPU times of every logical core.
+
+        Returns:
+            An (N, 3) float64 array with one [user, system, idle] row per core.
+        """
+        if self._stat_fd is not None:
+            # Per-core lines look like "cpu0 user nice system idle iowait ...".
+            # The block of them is tokenized with one split() and converted by
+            # NumPy, rather than line by line in Python.
+            data = os.pread(self._stat_fd, self._stat_read_size, 0)
+            start = data.index(b"\ncpu0") + 1
+            end = data.find(b"\n", data.rindex(b"\ncpu") + 1)
+            block = data[start:end]
+            fields = np.array(block.split()).reshape(block.count(b"\n") + 1, -1)
+            return fields[:, [1, 3, 4]].astype(np.float64)
+        return np.array([(t.user, t.system, t.idle) for t in psutil.cpu_times(percpu=True)], dtype=np.float64)
 
-    def _calculate_cpu_percent(self) -> (float, List[float]):
+    def _calculate_cpu_percent(self) -> (float, np.ndarray):
         """
         Calculates total and per-core CPU usage since the last call.
         This non-blocking approach is better than psutil.cpu_percent(interval=...).
+        All cores are handled at once with vectorized NumPy operations.
         """
-        current_times = psutil.cpu_times(percpu=True)
+        current_times = self._read_cpu_times()
         last_times = self._last_cpu_times
         self._last_cpu_times = current_times
 
-        per_cpu_percent = []
-        total_delta_user = 0
-        total_delta_system = 0
-        total_delta_idle = 0
-        total_delta_all = 0
-
-        for i in range(len(current_times)):
-            current = current_times[i]
-            last = last_times[i]
-
-            delta_user = current.user - last.user
-            delta_system = current.system - last.system
-            delta_idle = current.idle - last.idle
-            delta_all = delta_user + delta_system + delta_idle
-
-            # Avoid division by zero on the first run or if times haven't changed
-            if delta_all == 0:
-                percent = 0.0
-            else:
-                percent = (delta_user + delta_system) / delta_all * 100
-            
-            per_cpu_percent.append(max(0.0, min(100.0, percent)))
-
-            total_delta_user += delta_user
-            total_delta_system += delta_system
-            total_delta_idle += delta_idle
-            total_delta_all += delta_all
+        if current_times.shape != last_times.shape:
+            # A core went on- or offline; there is no baseline to compare against
+            return 0.0, np.zeros(len(current_times))
 
+        delta = current_times - last_times
+        busy = delta[:, 0] + delta[:, 1]
+        delta_all = busy + delta[:, 2]
+
+        # Avoid division by zero on the first run or if times haven't changed
+        per_cpu_percent = np.divide(busy * 100, delta_all, out=np.zeros_like(busy), where=delta_all > 0)
+        np.clip(per_cpu_percent, 0.0, 100.0, out=per_cpu_percent)
+
+        total_delta_all = delta_all.sum()
         if total_delta_all == 0:
             total_percent = 0.0
         else:
-            total_percent = (total_delta_user + total_delta_system) / total_delta_all * 100
-        
-        return max(0.0, min(100.0, total_percent)), per_cpu_percent
+            total_percent = busy.sum() / total_delta_all * 100
 
-    def _collect_data(self) -> Dict[str, Any]:
+        return max(0.0, min(100.0, float(total_percent))), per_cpu_percent
+
+    @staticmethod
+    def _fill_gpu_memory(processes: np.ndarray, memory_map: Dict[int, int]) -> None:
+        """
+        Writes the GPU memory of every process into its row. Only a handful of
+        PIDs use a GPU, so the map is matched against the PID column with one
+        sorted lookup rather than a call per row.
+        """
+        if not memory_map or not len(processes):
+            return
+        gpu_pids = np.fromiter(memory_map.keys(), dtype=np.int64, count=len(memory_map))
+        gpu_memory = np.fromiter(memory_map.values(), dtype=np.int64, count=len(memory_map))
+        order = np.argsort(gpu_pids)
+        gpu_pids, gpu_memory = gpu_pids[order], gpu_memory[order]
+
+        pids = processes['pid']
+        slots = np.minimum(np.searchsorted(gpu_pids, pids), len(gpu_pids) - 1)
+        found = gpu_pids[slots] == pids
+        processes['gpu_memory_bytes'][found] = gpu_memory[slots[found]]
+
+    def _collect_data(self) -> TickData:
         """Gathers all system metrics."""
         # RAM
         ram = psutil.virtual_memory()
@@ -106,37 +289,22 @@ class SystemMonitor(QObject):
         total_cpu_percent, per_cpu_percent = self._calculate_cpu_percent()
 
         # Processes
-        processes_data = []
-        for proc in psutil.process_iter(['pid', 'name', 'username', 'cpu_percent', 'memory_info', 'cmdline']):
-            try:
-                pinfo = proc.info
-                # Get full command line, handling potential empty lists
-                cmd = ' '.join(pinfo['cmdline']) if pinfo['cmdline'] else ''
-                processes_data.append({
-                    "pid": pinfo['pid'],
-                    "name": pinfo['name'],
-                    "cpu_percent": pinfo['cpu_percent'],
-                    "memory_bytes": pinfo['memory_info'].rss,
-                    "memory_percent": ram.total and (pinfo['memory_info'].rss / ram.total * 100) or 0,
-                    "gpu_memory_bytes": self.gpu_monitor.get_process_gpu_memory(pinfo['pid']),
-                    "command": cmd,
-                })
-            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                # Process might have terminated, or we lack permissions
-                pass
-
-        return {
-            "ram": {
-                "total": ram.total,
-                "used": ram.used,
-                "percent": ram.percent,
-            },
-            "cpu": {
-                "total_percent": total_cpu_percent,
-                "per_cpu_percent": per_cpu_percent,
-                "physical_cores": psutil.cpu_count(logical=False),
-                "logical_cores": psutil.cpu_count(logical=True),
-            },
-            "gpu": self.gpu_monitor.get_gpu_info(),
-            "processes": processes_data,
-        }
+        processes, names, commands = self.process_scanner.scan()
+        # RAM % for every process in one vectorized multiply
+        if ram.total:
+            np.multiply(processes['memory_bytes'], 100.0 / ram.total, out=processes['memory_percent'])
+        self._fill_gpu_memory(processes, self.gpu_monitor.pid_gpu_memory_map)
+
+        return TickData(
+            cpu_total=total_cpu_percent,
+            cpu_per_core=per_cpu_percent,
+            physical_cores=self._physical_cores,
+            logical_cores=self._logical_cores,
+            ram_total=ram.total,
+            ram_used=ram.used,
+            ram_percent=ram.percent,
+            gpu=self.gpu_monitor.get_gpu_info(),
+            processes=processes,
+            process_names=names,
+            process_commands=commands,
+        )
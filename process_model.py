@@ -0,0 +1,228 @@
+from typing import Any, List
+
+import numpy as np
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex, QSortFilterProxyModel
+
+from process_scanner import PROCESS_DTYPE, LazyCommand, ProcessSnapshot
+
+PROCESS_COLUMNS = ["PID", "Name", "CPU %", "RAM %", "GPU Mem (MB)", "Memory (MB)", "Command"]
+PID_COLUMN, NAME_COLUMN, CPU_COLUMN, RAM_COLUMN, GPU_MEM_COLUMN, MEMORY_COLUMN, COMMAND_COLUMN = range(len(PROCESS_COLUMNS))
+NUMERIC_COLUMNS = {PID_COLUMN, CPU_COLUMN, RAM_COLUMN, GPU_MEM_COLUMN, MEMORY_COLUMN}
+
+MB_PER_BYTE = 1.0 / 1024**2
+
+# Role returning the raw value of a cell, so numeric columns sort by number
+# rather than by their formatted text
+SORT_ROLE = Qt.UserRole
+
+
+def format_process_columns(processes: np.ndarray, names: List[str], commands: List[LazyCommand]) -> List[List[str]]:
+    """
+    Returns the display text of many rows at once, as one list per column.
+    The numeric columns are formatted in bulk by NumPy; this is for
+    consumers of every row, such as exports, while the view keeps
+    formatting just the cells it shows.
+    """
+    return [
+        np.char.mod('%d', processes['pid']).tolist(),
+        names,
+        np.char.mod('%.1f', processes['cpu_percent']).tolist(),
+        np.char.mod('%.2f', processes['memory_percent']).tolist(),
+        np.char.mod('%.2f', processes['gpu_memory_bytes'] * MB_PER_BYTE).tolist(),
+        np.char.mod('%.2f', processes['memory_bytes'] * MB_PER_BYTE).tolist(),
+        [str(command) for command in commands],
+    ]
+
+
+class ProcessTableModel(QAbstractTableModel):
+    """
+    Table model over the latest process snapshot.
+    The numeric columns stay in a PROCESS_DTYPE array and are formatted only
+    when the view asks for a cell, so the cost of a refresh depends on the
+    rows on screen rather than on every process. Rows keep their position
+    between refreshes; exited processes are removed and new ones appended.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._processes = np.zeros(0, dtype=PROCESS_DTYPE)
+        self._names: List[str] = []
+        # Lowercased names, aligned with _names, for sorting and filtering
+        self._lower_names: List[str] = []
+        self._commands: List[LazyCommand] = []
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._names)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(PROCESS_COLUMNS)
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.DisplayRole) -> Any:
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return PROCESS_COLUMNS[section]
+        return None
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole) -> Any:
+        if not index.isValid():
+            return None
+        row, column = index.row(), index.column()
+        if role == Qt.DisplayRole:
+            return self._display_text(row, column)
+        if role == SORT_ROLE:
+            return self._sort_value(row, column)
+        if role == Qt.TextAlignmentRole and column in NUMERIC_COLUMNS:
+            return int(Qt.AlignRight | Qt.AlignVCenter)
+        return None
+
+    def _display_text(self, row: int, column: int) -> str:
+        if column == NAME_COLUMN:
+            return self._names[row]
+        if column == COMMAND_COLUMN:
+            return str(self._commands[row])
+        process = self._processes[row]
+        if column == PID_COLUMN:
+            return str(process['pid'])
+        if column == CPU_COLUMN:
+            return f"{process['cpu_percent']:.1f}"
+        if column == RAM_COLUMN:
+            return f"{process['memory_percent']:.2f}"
+        if column == GPU_MEM_COLUMN:
+            return f"{process['gpu_memory_bytes'] * MB_PER_BYTE:.2f}"
+        return f"{process['memory_bytes'] * MB_PER_BYTE:.2f}"
+
+    def _sort_value(self, row: int, column: int) -> Any:
+        if column == NAME_COLUMN:
+            return self._lower_names[row]
+        if column == COMMAND_COLUMN:
+            return str(self._commands[row])
+        field = ('pid', None, 'cpu_percent', 'memory_percent', 'gpu_memory_bytes', 'memory_bytes')[column]
+        return self._processes[row][field].item()
+
+    def snapshot_rows(self, rows: np.ndarray) -> ProcessSnapshot:
+        """
+        Copies out the given rows, in that order, for use off the UI thread
+        while the model keeps updating.
+
+        Args:
+            rows: Model row numbers, in the order wanted.
+        """
+        row_list = rows.tolist()
+        return (self._processes[rows],
+                [self._names[row] for row in row_list],
+                [self._commands[row] for row in row_list])
+
+    def formatted_columns(self, rows: np.ndarray) -> List[List[str]]:
+        """Returns the display text of the given rows, see format_process_columns()."""
+        return format_process_columns(*self.snapshot_rows(rows))
+
+    def pid_at(self, row: int) -> int:
+        return int(self._processes[row]['pid'])
+
+    def name_at(self, row: int) -> str:
+        return self._names[row]
+
+    def lower_name_at(self, row: int) -> str:
+        return self._lower_names[row]
+
+    def update(self, processes: np.ndarray, names: List[str], commands: List[LazyCommand]) -> None:
+        """
+        Replaces the contents with a new snapshot, telling the views only about
+        what changed: removed rows, rows whose values differ, and new rows.
+        """
+        new_pids = processes['pid'].tolist()
+        new_row_of = dict(zip(new_pids, range(len(new_pids))))
+
+        # Exited processes, removed from the bottom up so row numbers stay
+        # valid, with one notification per run of adjacent rows
+        exited = np.fromiter((pid not in new_row_of for pid in self._processes['pid'].tolist()),
+                             dtype=bool, count=len(self._processes))
+        for first, last in reversed(self._runs(np.flatnonzero(exited))):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            self._processes = np.delete(self._processes, np.s_[first:last + 1])
+            del self._names[first:last + 1]
+            del self._lower_names[first:last + 1]
+            del self._commands[first:last + 1]
+            self.endRemoveRows()
+
+        # Processes still running, refreshed in place
+        if len(self._names):
+            source_rows = [new_row_of[pid] for pid in self._processes['pid'].tolist()]
+            updated = processes[source_rows]
+            changed = self._display_differs(updated, self._processes)
+            self._processes = updated
+            for row, source_row in enumerate(source_rows):
+                if self._names[row] != names[source_row]:
+                    self._names[row] = names[source_row]
+                    self._lower_names[row] = names[source_row].lower()
+                    changed[row] = True
+                if self._commands[row] is not commands[source_row]:
+                    # The scanner keeps one command object per process, so a
+                    # new one means the process called exec
+                    self._commands[row] = commands[source_row]
+                    changed[row] = True
+            last_column = len(PROCESS_COLUMNS) - 1
+            for first, last in self._runs(np.flatnonzero(changed)):
+                self.dataChanged.emit(self.index(first, 0), self.index(last, last_column), [Qt.DisplayRole, SORT_ROLE])
+
+        # New processes, appended in snapshot order
+        current_pids = set(self._processes['pid'].tolist())
+        added = [row for row, pid in enumerate(new_pids) if pid not in current_pids]
+        if added:
+            first = len(self._names)
+            self.beginInsertRows(QModelIndex(), first, first + len(added) - 1)
+            self._processes = np.concatenate([self._processes, processes[added]])
+            self._names.extend(names[row] for row in added)
+            self._lower_names.extend(names[row].lower() for row in added)
+            self._commands.extend(commands[row] for row in added)
+            self.endInsertRows()
+
+
+    @staticmethod
+    def _display_differs(new: np.ndarray, old: np.ndarray) -> np.ndarray:
+        """
+        Flags the rows whose numbers would be displayed differently. Most
+        processes sit idle, and a change below the displayed precision
+        (0.1% of CPU, 0.01% of RAM, a few KB of memory) doesn't warrant a
+        repaint.
+        """
+        return ((np.rint(new['cpu_percent'] * 10) != np.rint(old['cpu_percent'] * 10))
+                | (np.rint(new['memory_percent'] * 100) != np.rint(old['memory_percent'] * 100))
+                | (np.rint(new['memory_bytes'] * (MB_PER_BYTE * 100)) != np.rint(old['memory_bytes'] * (MB_PER_BYTE * 100)))
+                | (np.rint(new['gpu_memory_bytes'] * (MB_PER_BYTE * 100)) != np.rint(old['gpu_memory_bytes'] * (MB_PER_BYTE * 100))))
+
+    @staticmethod
+    def _runs(rows: np.ndarray) -> List[tuple]:
+        """Splits sorted row numbers into (first, last) runs of consecutive rows."""
+        if not len(rows):
+            return []
+        breaks = np.flatnonzero(np.diff(rows) != 1) + 1
+        starts = np.concatenate(([0], breaks))
+        ends = np.concatenate((breaks - 1, [len(rows) - 1]))
+        return list(zip(rows[starts].tolist(), rows[ends].tolist()))
+
+
+class ProcessFilterProxyModel(QSortFilterProxyModel):
+    """
+    Sorts the process table by raw values and filters it by a case-insensitive
+    substring of the PID or name.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._filter_text = ""
+        self.setSortRole(SORT_ROLE)
+
+    def set_filter_text(self, text: str) -> None:
+        filter_text = text.lower()
+        if filter_text == self._filter_text:
+            return
+        self._filter_text = filter_text
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row: int, source_parent: QModelIndex) -> bool:
+        filter_text = self._filter_text
+        if not filter_text:
+            return True
+        model = self.sourceModel()
+        return (filter_text in model.lower_name_at(source_row)
+                or filter_text in str(model.pid_at(source_row)))
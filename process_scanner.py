@@ -0,0 +1,315 @@
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import psutil
+
+from utils import log
+
+# Reading /proc directly is only possible on Linux. Other platforms fall
+# back to psutil, which knows how to query the native APIs.
+PROCFS_AVAILABLE = sys.platform.startswith("linux") and os.path.isdir("/proc")
+
+if PROCFS_AVAILABLE:
+    CLOCK_TICKS = os.sysconf("SC_CLK_TCK")
+    PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+
+# /proc/<pid>/stat is a single line; the fields we need (up to rss, field 24)
+# always fit in this many bytes.
+STAT_READ_SIZE = 1024
+# The kernel truncates the process name ("comm") to this many characters
+COMM_MAX_LENGTH = 15
+CMDLINE_READ_SIZE = 4096
+
+# The stat reads are blocking syscalls that release the GIL, so a few threads
+# can overlap them. Each task reads a batch of PIDs to keep the per-future
+# overhead small next to the syscalls themselves.
+STAT_READ_WORKERS = 8
+PIDS_PER_READ_TASK = 64
+
+# Attributes requested from psutil when /proc can't be read directly
+PSUTIL_ATTRS = ['name', 'cpu_percent', 'memory_info']
+
+# Numeric columns of the process table, one record per process. Names and
+# commands are kept in parallel lists since they are variable-length.
+PROCESS_DTYPE = np.dtype([
+    ('pid', np.int64),
+    ('cpu_percent', np.float64),
+    ('memory_bytes', np.int64),
+    ('memory_percent', np.float64),
+    ('gpu_memory_bytes', np.int64),
+])
+
+# A scan result: the PROCESS_DTYPE array plus the names and commands of its rows
+ProcessSnapshot = Tuple[np.ndarray, List[str], List['LazyCommand']]
+
+
+class LazyCommand:
+    """
+    The command line of a process, fetched only the first time it is
+    converted to a string. Most rows are never displayed, and long argument
+    lists (Java, browsers) make the read the costliest part of a row.
+    """
+    __slots__ = ('_read_text', '_text')
+
+    def __init__(self, read_text: Optional[Callable[[], str]], text: Optional[str] = None):
+        self._read_text = read_text
+        self._text = text
+
+    def __str__(self) -> str:
+        if self._text is None:
+            try:
+                self._text = self._read_text()
+            except (OSError, psutil.Error):
+                # Process is gone, or we lack permissions
+                self._text = ''
+            self._read_text = None
+        return self._text
+
+
+class ProcessScanner:
+    """
+    Collects the per-process rows shown in the process table.
+    On Linux it walks /proc itself, reading each PID's `stat` with raw
+    os.open/os.read calls spread over a small thread pool. This costs a
+    handful of syscalls per process instead of the several-per-attribute
+    that psutil performs. Names and
+    command lines are kept per PID, so `cmdline` is read at most once per
+    process, and only when needed.
+    """
+
+    def __init__(self):
+        self.use_procfs = PROCFS_AVAILABLE
+        # pid -> (start time, utime + stime, comm, name, command) from the
+        # previous scan. The ticks give CPU percentages; the start time and
+        # comm detect PID reuse and exec, which invalidate the cached name
+        # and command.
+        self._pid_state: Dict[int, Tuple[int, int, str, str, LazyCommand]] = {}
+        self._last_scan_time: Optional[float] = None
+        # pid -> (psutil.Process, command), reused between scans on the psutil path
+        self._proc_cache: Dict[int, Tuple[psutil.Process, LazyCommand]] = {}
+        self._read_pool: Optional[ThreadPoolExecutor] = None
+
+        if self.use_procfs:
+            self._read_pool = ThreadPoolExecutor(
+                max_workers=STAT_READ_WORKERS, thread_name_prefix="proc-reader")
+            log.info("Reading process information directly from /proc.")
+        else:
+            log.info("procfs not available. Using psutil for process information.")
+
+    def scan(self) -> ProcessSnapshot:
+        """
+        Gathers a row for every running process.
+
+        Returns:
+            A tuple of (rows, names, commands). `rows` is a PROCESS_DTYPE array
+            whose memory_percent and gpu_memory_bytes columns are left at 0
+            for the caller, which fills them for all rows at once; `names` and
+            `commands` are aligned with it.
+        """
+        if self.use_procfs:
+            return self._scan_procfs()
+        return self._scan_psutil()
+
+    def shutdown(self):
+        """Stops the /proc reader threads."""
+        if self._read_pool is not None:
+            self._read_pool.shutdown(wait=True)
+            self._read_pool = None
+
+    def _read_stats(self) -> List[Tuple[int, bytes]]:
+        """
+        Reads /proc/<pid>/stat for every running process, spreading the
+        reads over the thread pool when there are enough PIDs to split.
+
+        Returns:
+            A list of (pid, stat contents) in /proc directory order.
+        """
+        pids = [int(entry.name) for entry in os.scandir("/proc") if entry.name.isdigit()]
+        batches = [pids[i:i + PIDS_PER_READ_TASK] for i in range(0, len(pids), PIDS_PER_READ_TASK)]
+        if len(batches) <= 1 or self._read_pool is None:
+            return self._read_stat_batch(pids)
+        stats = []
+        for batch_stats in self._read_pool.map(self._read_stat_batch, batches):
+            stats.extend(batch_stats)
+        return stats
+
+    @staticmethod
+    def _read_stat_batch(pids: List[int]) -> List[Tuple[int, bytes]]:
+        """Reads the stat file of each PID, skipping processes that have exited."""
+        os_open, os_read, os_close, O_RDONLY = os.open, os.read, os.close, os.O_RDONLY
+        stats = []
+        for pid in pids:
+            try:
+                fd = os_open(f"/proc/{pid}/stat", O_RDONLY)
+                try:
+                    stats.append((pid, os_read(fd, STAT_READ_SIZE)))
+                finally:
+                    os_close(fd)
+            except OSError:
+                # Process terminated between the directory scan and the read
+                continue
+        return stats
+
+    def _scan_procfs(self) -> ProcessSnapshot:
+        now = time.monotonic()
+        elapsed = (now - self._last_scan_time) if self._last_scan_time is not None else 0.0
+        self._last_scan_time = now
+        # Converts a delta in clock ticks straight to a percentage of one CPU
+        ticks_to_percent = 100.0 / (CLOCK_TICKS * elapsed) if elapsed > 0 else 0.0
+
+        # This loop runs for every process on every refresh, so keep the
+        # functions it calls in locals rather than resolving them each time.
+        parse_stat = self._parse_stat
+        read_cmdline, read_command = self._read_cmdline, self._read_command
+        command_text, full_name = self._command_text, self._full_name
+        last_state_get = self._pid_state.get
+        pid_state: Dict[int, Tuple[int, int, str, str, LazyCommand]] = {}
+        rows, names, commands = [], [], []
+        append_row, append_name, append_command = rows.append, names.append, commands.append
+
+        # The reads are overlapped in the pool; parsing and the per-PID state
+        # stay on this thread.
+        for pid, stat in self._read_stats():
+            try:
+                comm, start_time, ticks, rss_pages = parse_stat(stat)
+            except (ValueError, IndexError):
+                # Process exited mid-read and left a short stat line
+                continue
+
+            last = last_state_get(pid)
+            if last is not None and last[0] == start_time:
+                cpu_percent = (ticks - last[1]) * ticks_to_percent
+            else:
+                cpu_percent = 0.0
+            if last is not None and last[0] == start_time and last[2] == comm:
+                name, command = last[3], last[4]
+            else:
+                # New process (or it called exec): only a truncated name
+                # needs the command line now; otherwise it is read on display.
+                if len(comm) >= COMM_MAX_LENGTH:
+                    try:
+                        cmdline = read_cmdline(pid)
+                    except OSError:
+                        cmdline = b''
+                    name = full_name(comm, cmdline)
+                    command = LazyCommand(None, command_text(cmdline))
+                else:
+                    name = comm
+                    command = LazyCommand(partial(read_command, pid))
+            pid_state[pid] = (start_time, ticks, comm, name, command)
+
+            append_row((pid, cpu_percent, rss_pages * PAGE_SIZE, 0.0, 0))
+            append_name(name)
+            append_command(command)
+
+        self._pid_state = pid_state
+        return np.array(rows, dtype=PROCESS_DTYPE), names, commands
+
+    def _scan_psutil(self) -> ProcessSnapshot:
+        # Process objects are kept across scans, so the steady-state PIDs skip
+        # Process.__init__ and keep the CPU times cpu_percent() compares against.
+        current_pids = set(psutil.pids())
+        proc_cache = self._proc_cache
+        for pid in proc_cache.keys() - current_pids:
+            del proc_cache[pid]
+        for pid in current_pids - proc_cache.keys():
+            try:
+                proc = psutil.Process(pid)
+                proc_cache[pid] = (proc, LazyCommand(partial(self._psutil_command, proc)))
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                pass
+
+        rows, names, commands = [], [], []
+        append_row, append_name, append_command = rows.append, names.append, commands.append
+        for pid, (proc, command) in list(proc_cache.items()):
+            try:
+                if not proc.is_running():
+                    # The PID was reused by a new process since it was cached
+                    proc = psutil.Process(pid)
+                    command = LazyCommand(partial(self._psutil_command, proc))
+                    proc_cache[pid] = (proc, command)
+                pinfo = proc.as_dict(attrs=PSUTIL_ATTRS, ad_value=None)
+            except (psutil.NoSuchProcess, psutil.ZombieProcess):
+                # Process terminated since psutil.pids() was called
+                del proc_cache[pid]
+                continue
+            except psutil.AccessDenied:
+                continue
+            # Attributes we lack permission for come back as None
+            rss = pinfo['memory_info'].rss if pinfo['memory_info'] else 0
+            append_row((pid, pinfo['cpu_percent'] or 0.0, rss, 0.0, 0))
+            append_name(pinfo['name'] or '')
+            append_command(command)
+        return np.array(rows, dtype=PROCESS_DTYPE), names, commands
+
+    @staticmethod
+    def _read_cmdline(pid: int) -> bytes:
+        """Reads the raw, NUL-separated contents of /proc/<pid>/cmdline."""
+        fd = os.open(f"/proc/{pid}/cmdline", os.O_RDONLY)
+        try:
+            cmdline = os.read(fd, CMDLINE_READ_SIZE)
+            # Long argument lists need more than one read
+            while cmdline and len(cmdline) % CMDLINE_READ_SIZE == 0:
+                chunk = os.read(fd, CMDLINE_READ_SIZE)
+                if not chunk:
+                    break
+                cmdline += chunk
+        finally:
+            os.close(fd)
+        return cmdline
+
+    @staticmethod
+    def _command_text(cmdline: bytes) -> str:
+        """
+        Turns raw cmdline contents into the space-separated command shown in
+        the table. Working on the bytes avoids splitting into a list of
+        arguments only to join them again.
+        """
+        return cmdline.rstrip(b'\x00').replace(b'\x00', b' ').decode('utf-8', 'replace')
+
+    @classmethod
+    def _read_command(cls, pid: int) -> str:
+        return cls._command_text(cls._read_cmdline(pid))
+
+    @staticmethod
+    def _psutil_command(proc: psutil.Process) -> str:
+        return ' '.join(proc.cmdline())
+
+    @staticmethod
+    def _full_name(name: str, cmdline: bytes) -> str:
+        """
+        Restores a process name the kernel truncated to COMM_MAX_LENGTH
+        characters, using the executable in argv[0] like psutil's name() does.
+        """
+        argv0 = cmdline.split(b'\x00', 1)[0]
+        if argv0:
+            exe_name = os.path.basename(argv0.decode('utf-8', 'replace'))
+            if exe_name.startswith(name):
+                return exe_name
+        return name
+
+    @staticmethod
+    def _parse_stat(data: bytes) -> Tuple[str, int, int, int]:
+        """
+        Parses the contents of /proc/<pid>/stat.
+
+        Returns:
+            A tuple of (name, start time, utime + stime, rss in pages). Times
+            are in clock ticks.
+        """
+        # The name is wrapped in parentheses and may itself contain spaces or
+        # parentheses, so split around the last closing one.
+        name_start = data.index(b'(') + 1
+        name_end = data.rindex(b')')
+        name = data[name_start:name_end].decode('utf-8', 'replace')
+        # fields[0] is field 3 (state) in proc(5) numbering
+        fields = data[name_end + 2:].split()
+        utime, stime = int(fields[11]), int(fields[12])
+        start_time = int(fields[19])
+        rss_pages = int(fields[21])
+        return name, start_time, utime + stime, rss_pages
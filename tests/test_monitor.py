@@ -1,3 +1,4 @@
+import time
 import unittest
 from unittest.mock import patch, MagicMock
 
@@ -6,7 +7,21 @@ import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+import numpy as np
+from PySide6.QtCore import Qt
+
 from gpu_monitor import GPUMonitor
+from monitor import SystemMonitor, TickData
+from process_model import ProcessFilterProxyModel, ProcessTableModel, SORT_ROLE
+from process_scanner import LazyCommand, PROCESS_DTYPE, ProcessScanner, PROCFS_AVAILABLE
+from workers import ExportRunnable, KillRunnable
+
+
+class FakeNVMLError(Exception):
+    """Stands in for pynvml.NVMLError, carrying an NVML return code."""
+    def __init__(self, value):
+        super().__init__(value)
+        self.value = value
 
 class TestGPUMonitor(unittest.TestCase):
 
@@ -42,5 +57,579 @@ class TestGPUMonitor(unittest.TestCase):
         monitor.shutdown()
         mock_pynvml.nvmlShutdown.assert_called_once()
 
+    @patch('gpu_monitor.pynvml')
+    def test_gpu_monitor_caches_static_device_info(self, mock_pynvml):
+        """
+        Test that handles, names and UUIDs are queried once, not on every refresh.
+        """
+        mock_pynvml.nvmlDeviceGetCount.return_value = 2
+        mock_pynvml.nvmlDeviceGetMemoryInfo.return_value = MagicMock(total=100, used=25)
+        mock_pynvml.nvmlDeviceGetUtilizationRates.return_value = MagicMock(gpu=50)
+        monitor = GPUMonitor()
+
+        for _ in range(3):
+            monitor.refresh()
+            gpu_info = monitor.get_gpu_info()
+
+        self.assertEqual(len(gpu_info), 2)
+        self.assertEqual(gpu_info[0]["memory_percent"], 25)
+        self.assertEqual(gpu_info[0]["gpu_utilization"], 50)
+        self.assertEqual(mock_pynvml.nvmlDeviceGetHandleByIndex.call_count, 2)
+        self.assertEqual(mock_pynvml.nvmlDeviceGetName.call_count, 2)
+        self.assertEqual(mock_pynvml.nvmlDeviceGetUUID.call_count, 2)
+        self.assertEqual(mock_pynvml.nvmlDeviceGetMemoryInfo.call_count, 6)
+
+    @patch('gpu_monitor.pynvml')
+    def test_process_map_merges_compute_and_graphics(self, mock_pynvml):
+        """
+        Test that per-PID GPU memory is merged across context types and devices.
+        """
+        mock_pynvml.nvmlDeviceGetCount.return_value = 2
+        mock_pynvml.nvmlDeviceGetComputeRunningProcesses.return_value = [
+            MagicMock(pid=10, usedGpuMemory=100), MagicMock(pid=20, usedGpuMemory=None)]
+        mock_pynvml.nvmlDeviceGetGraphicsRunningProcesses.return_value = [
+            MagicMock(pid=10, usedGpuMemory=100), MagicMock(pid=30, usedGpuMemory=5)]
+        mock_pynvml.nvmlDeviceGetMPSComputeRunningProcesses.return_value = [
+            MagicMock(pid=40, usedGpuMemory=1)]
+        mock_pynvml.nvmlDeviceGetMemoryInfo.return_value = MagicMock(total=100, used=25)
+        monitor = GPUMonitor()
+
+        monitor.refresh()
+        self.assertEqual(monitor.get_process_gpu_memory(10), 200)
+        self.assertEqual(monitor.get_process_gpu_memory(20), 0)
+        self.assertEqual(monitor.get_process_gpu_memory(30), 10)
+        self.assertEqual(monitor.get_process_gpu_memory(40), 2)
+
+    @patch('gpu_monitor.pynvml')
+    def test_refresh_without_processes_keeps_pid_map(self, mock_pynvml):
+        """
+        Test that a stats-only refresh skips the process queries and keeps the last map.
+        """
+        mock_pynvml.nvmlDeviceGetCount.return_value = 1
+        mock_pynvml.nvmlDeviceGetMemoryInfo.return_value = MagicMock(total=100, used=25)
+        mock_pynvml.nvmlDeviceGetComputeRunningProcesses.return_value = [
+            MagicMock(pid=10, usedGpuMemory=100)]
+        monitor = GPUMonitor()
+
+        monitor.refresh()
+        monitor.refresh(include_processes=False)
+        self.assertEqual(monitor.get_process_gpu_memory(10), 100)
+        self.assertEqual(len(monitor.get_gpu_info()), 1)
+        self.assertEqual(mock_pynvml.nvmlDeviceGetComputeRunningProcesses.call_count, 1)
+        self.assertEqual(mock_pynvml.nvmlDeviceGetMemoryInfo.call_count, 2)
+
+    @patch('gpu_monitor.pynvml')
+    def test_direct_stat_queries_fill_reused_structs(self, mock_pynvml):
+        """
+        Test the direct NVML bindings: results are copied out of the shared
+        structs and error codes raise NVMLError like the pynvml wrappers do.
+        """
+        import ctypes
+        import pynvml
+
+        mock_pynvml.NVMLError = FakeNVMLError
+        mock_pynvml.NVML_SUCCESS = 0
+        mock_pynvml.nvmlDeviceGetCount.return_value = 2
+        mock_pynvml.nvmlLib = MagicMock(spec=ctypes.CDLL)
+        mock_pynvml.c_nvmlMemory_t = pynvml.c_nvmlMemory_t
+        mock_pynvml.c_nvmlUtilization_t = pynvml.c_nvmlUtilization_t
+        device_used = iter([10, 30])
+
+        def get_memory(handle, memory_ref):
+            memory_ref._obj.total, memory_ref._obj.used = 100, next(device_used)
+            return 0
+
+        def get_utilization(handle, utilization_ref):
+            utilization_ref._obj.gpu = 7
+            return 0
+        mock_pynvml._nvmlGetFunctionPointer.side_effect = {
+            "nvmlDeviceGetMemoryInfo": get_memory,
+            "nvmlDeviceGetUtilizationRates": get_utilization,
+        }.get
+        monitor = GPUMonitor()
+
+        monitor.refresh(include_processes=False)
+        gpu_info = monitor.get_gpu_info()
+        self.assertEqual([gpu["used_memory"] for gpu in gpu_info], [10, 30])
+        self.assertEqual(gpu_info[1]["gpu_utilization"], 7)
+        mock_pynvml.nvmlDeviceGetMemoryInfo.assert_not_called()
+
+        monitor._stat_queries = (lambda handle, ref: 999,) + monitor._stat_queries[1:]
+        with self.assertRaises(FakeNVMLError):
+            monitor._query_device_stats(None)
+
+    @patch('gpu_monitor.pynvml')
+    def test_unsupported_graphics_query_keeps_compute_data(self, mock_pynvml):
+        """
+        Test that an unsupported graphics query neither drops compute results
+        nor triggers the backoff, and is not retried.
+        """
+        mock_pynvml.NVMLError = FakeNVMLError
+        mock_pynvml.NVML_ERROR_NOT_SUPPORTED = 3
+        mock_pynvml.nvmlDeviceGetCount.return_value = 1
+        mock_pynvml.nvmlDeviceGetComputeRunningProcesses.return_value = [
+            MagicMock(pid=10, usedGpuMemory=100)]
+        mock_pynvml.nvmlDeviceGetGraphicsRunningProcesses.side_effect = FakeNVMLError(3)
+        mock_pynvml.nvmlDeviceGetMPSComputeRunningProcesses.return_value = []
+        mock_pynvml.nvmlDeviceGetMemoryInfo.return_value = MagicMock(total=100, used=25)
+        monitor = GPUMonitor()
+
+        monitor.refresh()
+        monitor.refresh()
+        self.assertEqual(monitor.get_process_gpu_memory(10), 100)
+        self.assertEqual(monitor._process_backoff.fail_streak, 0)
+        self.assertEqual(mock_pynvml.nvmlDeviceGetGraphicsRunningProcesses.call_count, 1)
+
+    @patch('gpu_monitor.time')
+    @patch('gpu_monitor.pynvml')
+    def test_gpu_monitor_backs_off_after_failure(self, mock_pynvml, mock_time):
+        """
+        Test that NVML queries are suspended with a growing delay after errors.
+        """
+        mock_pynvml.NVMLError = FakeNVMLError
+        mock_pynvml.nvmlDeviceGetCount.return_value = 1
+        mock_pynvml.nvmlDeviceGetMemoryInfo.side_effect = FakeNVMLError(999)
+        mock_time.monotonic.return_value = 1000.0
+        monitor = GPUMonitor()
+
+        for _ in range(2):
+            monitor.refresh()
+            self.assertEqual(monitor.get_gpu_info(), [])
+        self.assertEqual(mock_pynvml.nvmlDeviceGetMemoryInfo.call_count, 1)
+
+        # The first failure suspends queries for 30s, the second for 60s
+        mock_time.monotonic.return_value = 1031.0
+        monitor.refresh()
+        self.assertEqual(mock_pynvml.nvmlDeviceGetMemoryInfo.call_count, 2)
+        self.assertEqual(monitor._info_backoff.fail_until, 1091.0)
+
+        # A successful query clears the backoff
+        mock_pynvml.nvmlDeviceGetMemoryInfo.side_effect = None
+        mock_pynvml.nvmlDeviceGetMemoryInfo.return_value = MagicMock(total=100, used=25)
+        mock_time.monotonic.return_value = 1092.0
+        monitor.refresh()
+        self.assertEqual(len(monitor.get_gpu_info()), 1)
+        self.assertEqual(monitor._info_backoff.fail_streak, 0)
+
+    @patch('gpu_monitor.pynvml')
+    def test_process_query_failure_does_not_suspend_gpu_info(self, mock_pynvml):
+        """
+        Test that a failing process listing only backs off the PID map.
+        """
+        mock_pynvml.NVMLError = FakeNVMLError
+        mock_pynvml.nvmlDeviceGetCount.return_value = 1
+        mock_pynvml.nvmlDeviceGetComputeRunningProcesses.side_effect = FakeNVMLError(999)
+        mock_pynvml.nvmlDeviceGetMemoryInfo.return_value = MagicMock(total=100, used=25)
+        monitor = GPUMonitor()
+
+        for _ in range(3):
+            monitor.refresh()
+            self.assertEqual(len(monitor.get_gpu_info()), 1)
+        self.assertEqual(mock_pynvml.nvmlDeviceGetComputeRunningProcesses.call_count, 1)
+        self.assertEqual(monitor.get_process_gpu_memory(10), 0)
+
+    @patch('gpu_monitor.pynvml')
+    def test_gpu_monitor_disables_without_devices(self, mock_pynvml):
+        """
+        Test that NVML is released right away when no GPU is present.
+        """
+        mock_pynvml.nvmlDeviceGetCount.return_value = 0
+        monitor = GPUMonitor()
+        self.assertFalse(monitor.is_available)
+        mock_pynvml.nvmlShutdown.assert_called_once()
+        monitor.shutdown()
+        mock_pynvml.nvmlShutdown.assert_called_once()
+
+    @patch('gpu_monitor.pynvml')
+    def test_lost_gpu_disables_monitoring(self, mock_pynvml):
+        """
+        Test that a fatal NVML error shuts NVML down instead of backing off.
+        """
+        mock_pynvml.NVMLError = FakeNVMLError
+        mock_pynvml.NVML_ERROR_GPU_IS_LOST = 15
+        mock_pynvml.nvmlDeviceGetCount.return_value = 1
+        mock_pynvml.nvmlDeviceGetComputeRunningProcesses.side_effect = FakeNVMLError(15)
+        mock_pynvml.nvmlDeviceGetMemoryInfo.return_value = MagicMock(total=100, used=25)
+        monitor = GPUMonitor()
+
+        monitor.refresh()
+        self.assertFalse(monitor.is_available)
+        self.assertEqual(monitor.get_gpu_info(), [])
+        monitor.refresh()
+        monitor.shutdown()
+        self.assertEqual(mock_pynvml.nvmlDeviceGetComputeRunningProcesses.call_count, 1)
+        mock_pynvml.nvmlShutdown.assert_called_once()
+        self.assertEqual(mock_pynvml.nvmlDeviceGetMemoryInfo.call_count, 1)
+
+class TestProcessScanner(unittest.TestCase):
+
+    def test_parse_stat_handles_parentheses_in_name(self):
+        """
+        Test that process names containing spaces and parentheses are parsed.
+        """
+        fields = ["S"] + [str(i) for i in range(4, 53)]
+        data = f"42 (my (odd) proc) {' '.join(fields)}\n".encode()
+        name, start_time, ticks, rss_pages = ProcessScanner._parse_stat(data)
+        self.assertEqual(name, "my (odd) proc")
+        self.assertEqual(ticks, 14 + 15)
+        self.assertEqual(start_time, 22)
+        self.assertEqual(rss_pages, 24)
+
+    def test_full_name_restores_truncated_name(self):
+        """
+        Test that names cut to 15 characters by the kernel are restored from argv[0].
+        """
+        cmdline = b"/usr/bin/a_very_long_process_name\x00--flag\x00"
+        self.assertEqual(ProcessScanner._full_name("a_very_long_pro", cmdline), "a_very_long_process_name")
+        # argv[0] that doesn't match (e.g. a rewritten process title) is ignored
+        self.assertEqual(ProcessScanner._full_name("a_very_long_pro", b"other\x00"), "a_very_long_pro")
+        self.assertEqual(ProcessScanner._full_name("a_very_long_pro", b""), "a_very_long_pro")
+
+    def test_command_text_joins_arguments(self):
+        """
+        Test that raw cmdline bytes become a space-separated command.
+        """
+        self.assertEqual(ProcessScanner._command_text(b"python\x00-m\x00pytest\x00"), "python -m pytest")
+        self.assertEqual(ProcessScanner._command_text(b""), "")
+
+    def test_scan_includes_current_process(self):
+        """
+        Test that a scan reports the running test process with sane values.
+        """
+        scanner = ProcessScanner()
+        processes, names, commands = scanner.scan()
+        self.assertEqual(len(processes), len(names))
+        self.assertEqual(len(processes), len(commands))
+        current = processes[processes['pid'] == os.getpid()]
+        self.assertEqual(len(current), 1)
+        self.assertGreater(current[0]['memory_bytes'], 0)
+        self.assertGreaterEqual(current[0]['cpu_percent'], 0.0)
+
+    def test_psutil_scan_reuses_process_objects(self):
+        """
+        Test that the psutil fallback keeps Process objects between scans.
+        """
+        scanner = ProcessScanner()
+        scanner.use_procfs = False
+        scanner.scan()
+        cached = scanner._proc_cache[os.getpid()]
+        processes, _, _ = scanner.scan()
+        self.assertIs(scanner._proc_cache[os.getpid()][0], cached[0])
+        current = processes[processes['pid'] == os.getpid()]
+        self.assertEqual(len(current), 1)
+        self.assertGreater(current[0]['memory_bytes'], 0)
+
+    def test_lazy_command_reads_once(self):
+        """
+        Test that a command line is only fetched when first displayed.
+        """
+        read_text = MagicMock(return_value="python -m pytest")
+        command = LazyCommand(read_text)
+        read_text.assert_not_called()
+        self.assertEqual(str(command), "python -m pytest")
+        self.assertEqual(str(command), "python -m pytest")
+        read_text.assert_called_once()
+        self.assertEqual(str(LazyCommand(MagicMock(side_effect=OSError))), "")
+
+    @unittest.skipUnless(PROCFS_AVAILABLE, "requires /proc")
+    def test_procfs_scan_matches_psutil(self):
+        """
+        Test that the /proc reader agrees with psutil for the current process.
+        """
+        import psutil
+        scanner = ProcessScanner()
+        processes, names, commands = scanner.scan()
+        row = processes['pid'].tolist().index(os.getpid())
+        proc = psutil.Process(os.getpid())
+        self.assertEqual(names[row], proc.name())
+        self.assertEqual(str(commands[row]), ' '.join(proc.cmdline()))
+
+    @unittest.skipUnless(PROCFS_AVAILABLE, "requires /proc")
+    @patch('process_scanner.PIDS_PER_READ_TASK', 2)
+    def test_pooled_stat_reads_cover_every_pid(self):
+        """
+        Test that splitting the stat reads across the pool reads every PID once.
+        """
+        scanner = ProcessScanner()
+        self.addCleanup(scanner.shutdown)
+        pooled = [pid for pid, _ in scanner._read_stats()]
+        self.assertIn(os.getpid(), pooled)
+        self.assertEqual(len(pooled), len(set(pooled)))
+        self.assertGreater(len(pooled), 2)
+        self.assertEqual(scanner._read_stat_batch([os.getpid(), 2 ** 30])[0][0], os.getpid())
+
+class TestSystemMonitor(unittest.TestCase):
+
+    def test_calculate_cpu_percent(self):
+        """
+        Test per-core and total CPU usage computed from two CPU time samples.
+        """
+        first = np.array([[10, 10, 80], [0, 0, 100], [5, 5, 5]], dtype=np.float64)
+        second = np.array([[30, 20, 90], [0, 0, 200], [5, 5, 5]], dtype=np.float64)
+        with patch.object(SystemMonitor, '_read_cpu_times', side_effect=[first, second]):
+            monitor = SystemMonitor()
+            self.addCleanup(monitor.close)
+            total, per_core = monitor._calculate_cpu_percent()
+
+        self.assertEqual(per_core.tolist(), [75.0, 0.0, 0.0])
+        self.assertAlmostEqual(total, 30 / 140 * 100)
+
+    def test_stop_interrupts_refresh_wait(self):
+        """
+        Test that stop() wakes the monitor loop instead of waiting out the interval.
+        """
+        monitor = SystemMonitor(refresh_interval=60)
+        self.addCleanup(monitor.stop)
+        monitor.start()
+        deadline = time.monotonic() + 10
+        while monitor.take_latest() is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertLess(time.monotonic(), deadline)
+        monitor.stop(timeout=2)
+        self.assertFalse(monitor._thread.is_alive())
+
+    def test_wake_during_refresh_is_not_lost(self):
+        """
+        Test that a wake arriving before the loop waits cuts that wait short.
+        """
+        monitor = SystemMonitor(refresh_interval=60)
+        self.addCleanup(monitor.stop)
+        ticks = []
+        collect = monitor._collect_data
+        with patch.object(monitor, '_collect_data', side_effect=lambda: ticks.append(1) or collect()):
+            # Stands in for a request_refresh() landing while a refresh runs
+            monitor.request_refresh()
+            monitor.start()
+            deadline = time.monotonic() + 10
+            while len(ticks) < 2 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            monitor.stop(timeout=2)
+        self.assertGreaterEqual(len(ticks), 2)
+        self.assertFalse(monitor._thread.is_alive())
+
+    def test_refresh_deadlines_do_not_drift(self):
+        """
+        Test that refreshes stay on a fixed schedule and overruns skip missed slots.
+        """
+        self.assertEqual(SystemMonitor._next_deadline(100.0, 1.5, now=100.4), 101.5)
+        self.assertEqual(SystemMonitor._next_deadline(101.5, 1.5, now=101.6), 103.0)
+        self.assertEqual(SystemMonitor._next_deadline(103.0, 1.5, now=107.0), 107.0)
+
+    def test_take_latest_drops_superseded_snapshots(self):
+        """
+        Test that the UI only ever receives the newest snapshot, once.
+        """
+        monitor = SystemMonitor()
+        self.addCleanup(monitor.close)
+        first, second = MagicMock(spec=TickData), MagicMock(spec=TickData)
+        monitor._latest = first
+        monitor._latest = second
+        self.assertIs(monitor.take_latest(), second)
+        self.assertIsNone(monitor.take_latest())
+
+    def test_refresh_slows_down_while_idle(self):
+        """
+        Test that unchanged readings stretch the interval and a change resets it.
+        """
+        monitor = SystemMonitor(refresh_interval=1.0)
+        self.addCleanup(monitor.close)
+
+        def snapshot(cpu, process_count=5):
+            return TickData(
+                cpu_total=cpu, cpu_per_core=np.zeros(1), physical_cores=1, logical_cores=1,
+                ram_total=100, ram_used=40, ram_percent=40.0, gpu=[{"gpu_utilization": 3}],
+                processes=np.zeros(process_count, dtype=PROCESS_DTYPE),
+                process_names=[""] * process_count, process_commands=[None] * process_count)
+
+        intervals = []
+        for cpu in (10.0, 10.5, 11.0, 10.0, 10.2, 10.1):
+            monitor._update_cadence(snapshot(cpu))
+            intervals.append(monitor._effective_interval)
+        self.assertEqual(intervals, [1.0, 1.0, 1.0, 2.0, 4.0, 8.0])
+
+        monitor._update_cadence(snapshot(10.1, process_count=6))
+        self.assertEqual(monitor._effective_interval, 1.0)
+        for _ in range(10):
+            monitor._update_cadence(snapshot(10.1, process_count=6))
+        self.assertEqual(monitor._effective_interval, 30.0)
+        monitor.request_refresh()
+        self.assertEqual(monitor._effective_interval, 1.0)
+
+    def test_fill_gpu_memory_matches_pids(self):
+        """
+        Test that GPU memory lands on the rows of the PIDs in the map only.
+        """
+        processes = np.zeros(4, dtype=PROCESS_DTYPE)
+        processes['pid'] = [7, 3, 12, 5]
+        SystemMonitor._fill_gpu_memory(processes, {12: 300, 3: 100, 99: 900})
+        self.assertEqual(processes['gpu_memory_bytes'].tolist(), [0, 100, 300, 0])
+        SystemMonitor._fill_gpu_memory(processes[:0], {3: 1})
+
+    def test_collect_data_builds_tick(self):
+        """
+        Test that a refresh produces a complete, read-only TickData.
+        """
+        monitor = SystemMonitor()
+        self.addCleanup(monitor.close)
+        data = monitor._collect_data()
+        self.assertEqual(len(data.cpu_per_core), len(monitor._last_cpu_times))
+        self.assertEqual(len(data.processes), len(data.process_names))
+        self.assertGreater(data.ram_total, 0)
+        with self.assertRaises(AttributeError):
+            data.ram_total = 0
+
+    def test_read_cpu_times_shape(self):
+        """
+        Test that there is one [user, system, idle] row per logical core.
+        """
+        import psutil
+        monitor = SystemMonitor()
+        self.addCleanup(monitor.close)
+        times = monitor._read_cpu_times()
+        self.assertEqual(times.shape, (len(psutil.cpu_times(percpu=True)), 3))
+        # Re-reading the open /proc/stat descriptor sees fresh, never smaller counters
+        self.assertTrue((monitor._read_cpu_times() >= times).all())
+        monitor.close()
+        self.assertIsNone(monitor._stat_fd)
+        monitor.close()
+
+class TestProcessTableModel(unittest.TestCase):
+
+    def setUp(self):
+        # Like the scanner, hand out one command object per process
+        self._commands = {}
+
+    def _snapshot(self, pids, cpu=None):
+        processes = np.zeros(len(pids), dtype=PROCESS_DTYPE)
+        processes['pid'] = pids
+        processes['cpu_percent'] = cpu if cpu is not None else 0.0
+        commands = [self._commands.setdefault(pid, LazyCommand(None, f"cmd {pid}")) for pid in pids]
+        return processes, [f"proc{pid}" for pid in pids], commands
+
+    def _pids(self, model):
+        return [model.index(row, 0).data() for row in range(model.rowCount())]
+
+    def test_update_diffs_rows(self):
+        """
+        Test that a refresh removes exited rows, keeps survivors in place and
+        appends new ones, signalling only the rows that changed.
+        """
+        model = ProcessTableModel()
+        model.update(*self._snapshot([1, 2, 3]))
+        changed_rows = []
+        model.dataChanged.connect(lambda top_left, bottom_right, roles: changed_rows.append(top_left.row()))
+
+        model.update(*self._snapshot([4, 3, 1], cpu=[0.0, 5.0, 0.0]))
+        self.assertEqual(self._pids(model), ["1", "3", "4"])
+        self.assertEqual(changed_rows, [1])
+        self.assertEqual(model.index(1, 2).data(), "5.0")
+        self.assertEqual(model.index(1, 2).data(SORT_ROLE), 5.0)
+        self.assertEqual(model.index(2, 6).data(), "cmd 4")
+
+    def test_proxy_filters_by_pid_or_name(self):
+        """
+        Test the case-insensitive PID/name filter and numeric sorting.
+        """
+        model = ProcessTableModel()
+        model.update(*self._snapshot([5, 12, 100], cpu=[10.0, 9.0, 100.0]))
+        proxy = ProcessFilterProxyModel()
+        proxy.setSourceModel(model)
+
+        proxy.set_filter_text("PROC1")
+        self.assertEqual(self._pids(proxy), ["12", "100"])
+        # Rows removed and appended while filtering keep matching by their own name
+        model.update(*self._snapshot([12, 100, 17], cpu=[9.0, 100.0, 1.0]))
+        self.assertEqual(self._pids(proxy), ["12", "100", "17"])
+        model.update(*self._snapshot([5, 12, 100], cpu=[10.0, 9.0, 100.0]))
+        proxy.set_filter_text("")
+        proxy.sort(2, Qt.DescendingOrder)
+        self.assertEqual(self._pids(proxy), ["100", "5", "12"])
+
+    def test_update_coalesces_adjacent_rows(self):
+        """
+        Test that adjacent removed and changed rows are signalled as ranges.
+        """
+        model = ProcessTableModel()
+        model.update(*self._snapshot(list(range(1, 9))))
+        removed, changed = [], []
+        model.rowsRemoved.connect(lambda parent, first, last: removed.append((first, last)))
+        model.dataChanged.connect(lambda top_left, bottom_right, roles: changed.append((top_left.row(), bottom_right.row())))
+
+        model.update(*self._snapshot([1, 4, 7, 8], cpu=[1.0, 1.0, 1.0, 0.0]))
+        self.assertEqual(self._pids(model), ["1", "4", "7", "8"])
+        self.assertEqual(removed, [(4, 5), (1, 2)])
+        self.assertEqual(changed, [(0, 2)])
+
+    def test_formatted_columns_match_display_text(self):
+        """
+        Test that bulk formatting produces the same text as the view shows.
+        """
+        model = ProcessTableModel()
+        processes, names, commands = self._snapshot([3, 1, 2], cpu=[12.345, 0.05, 100.0])
+        processes['memory_bytes'] = [0, 1536 * 1024, 7 * 1024**3]
+        processes['memory_percent'] = [0.004, 1.0, 99.999]
+        model.update(processes, names, commands)
+
+        rows = np.array([2, 0, 1])
+        columns = model.formatted_columns(rows)
+        for column, texts in enumerate(columns):
+            self.assertEqual(texts, [model.index(row, column).data() for row in rows])
+
+    @patch('workers.CSV_EXPORT_CHUNK_ROWS', 2)
+    def test_export_runnable_writes_snapshot(self):
+        """
+        Test that the export worker writes every snapshot row across chunks.
+        """
+        import csv
+        import tempfile
+        model = ProcessTableModel()
+        model.update(*self._snapshot([1, 2, 3], cpu=[1.0, 2.0, 3.0]))
+        path = os.path.join(tempfile.mkdtemp(), "export.csv")
+        self.addCleanup(os.remove, path)
+        runnable = ExportRunnable(path, model.snapshot_rows(np.array([2, 0, 1])))
+        finished = []
+        runnable.signals.finished.connect(finished.append, Qt.DirectConnection)
+
+        runnable.run()
+        with open(path, newline='', encoding='utf-8') as file:
+            rows = list(csv.reader(file))
+        self.assertEqual(finished, [path])
+        self.assertEqual([row[0] for row in rows], ["PID", "3", "1", "2"])
+        self.assertEqual(rows[1], ["3", "proc3", "3.0", "0.00", "0.00", "0.00", "cmd 3"])
+
+    def test_kill_runnable_reports_outcome(self):
+        """
+        Test that the kill worker terminates the process, and reports a PID that
+        no longer exists as a failure.
+        """
+        import subprocess
+        proc = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+        self.addCleanup(proc.kill)
+        runnable = KillRunnable(proc.pid, "sleeper")
+        finished = []
+        runnable.signals.finished.connect(finished.append, Qt.DirectConnection)
+        runnable.run()
+        self.assertEqual(finished, ["sleeper"])
+        self.assertIsNotNone(proc.wait(timeout=5))
+
+        runnable = KillRunnable(proc.pid, "sleeper")
+        failed = []
+        runnable.signals.failed.connect(failed.append, Qt.DirectConnection)
+        runnable.run()
+        self.assertEqual(failed, ["Process no longer exists."])
+
+    def test_update_ignores_changes_below_display_precision(self):
+        """
+        Test that a value change that doesn't alter the displayed text isn't signalled.
+        """
+        model = ProcessTableModel()
+        model.update(*self._snapshot([1, 2], cpu=[0.0, 3.0]))
+        changed = []
+        model.dataChanged.connect(lambda top_left, bottom_right, roles: changed.append(top_left.row()))
+
+        model.update(*self._snapshot([1, 2], cpu=[0.01, 3.2]))
+        self.assertEqual(changed, [1])
+        self.assertEqual(model.index(1, 2).data(), "3.2")
+
 if __name__ == '__main__':
     unittest.main()
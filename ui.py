@@ -1,26 +1,35 @@
 import sys
 import time
-import csv
-from collections import deque
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Tuple
 
+import numpy as np
 import psutil
-from PySide6.QtCore import Qt, QThread, Slot, QTimer, QSize
-from PySide6.QtGui import QColor, QAction
+from PySide6.QtCore import Qt, QThreadPool, QTimer, QSize
+from PySide6.QtGui import QColor, QAction, QPen
 from PySide6.QtWidgets import (
-    QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel,
-    QProgressBar, QTableWidget, QTableWidgetItem, QHeaderView, QLineEdit,
+    QApplication, QGraphicsItem, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel,
+    QProgressBar, QTableView, QAbstractItemView, QHeaderView, QLineEdit,
     QTabWidget, QGridLayout, QFrame, QMessageBox, QMenu, QPushButton, QFileDialog
 )
 import pyqtgraph as pg
 
-from monitor import SystemMonitor
+from monitor import SystemMonitor, TickData
+from process_model import ProcessFilterProxyModel, ProcessTableModel
+from process_scanner import LazyCommand
 from utils import log
+from workers import ExportRunnable, KillRunnable
 
 # --- Configuration ---
 REFRESH_INTERVAL_MS = 1500
+# How often the UI checks for a new snapshot from the monitor thread
+UI_POLL_INTERVAL_MS = 250
+# The process filter is applied once typing pauses for this long
+FILTER_DEBOUNCE_MS = 75
 CHART_HISTORY_LENGTH = 60
 HIGH_USAGE_THRESHOLD = 80.0
+# Draw the charts through OpenGL. Needs PyOpenGL; falls back to the raster
+# painter when it isn't installed.
+USE_OPENGL_PLOTS = False
 
 # --- Styling ---
 STYLE_SHEET = """
@@ -45,9 +54,52 @@ STYLE_SHEET = """
         background-color: #05B8CC;
         width: 10px;
     }
+    QProgressBar[usage="high"]::chunk {
+        background-color: #F73859;
+    }
+    QProgressBar[usage="normal"]::chunk {
+        background-color: #05B8CC;
+    }
 """
-HIGH_USAGE_STYLE = "QProgressBar::chunk { background-color: #F73859; }"
-NORMAL_USAGE_STYLE = "QProgressBar::chunk { background-color: #05B8CC; }"
+# Dynamic property the progress bar rules above select on
+USAGE_PROPERTY = "usage"
+
+
+def configure_plotting():
+    """Sets the global pyqtgraph options. Must run before any chart is created."""
+    pg.setConfigOptions(antialias=False)
+    if USE_OPENGL_PLOTS:
+        try:
+            import OpenGL  # noqa: F401 (PyOpenGL, only needed to enable the option)
+            pg.setConfigOptions(useOpenGL=True, enableExperimental=True)
+            log.info("OpenGL chart rendering enabled.")
+        except ImportError:
+            log.warning("PyOpenGL is not installed. Charts use the default renderer.")
+
+
+class HistoryBuffer:
+    """
+    A fixed-length history of chart values in a preallocated ring buffer.
+    Every value is written twice, N slots apart, into an array of length 2N,
+    so the latest N values always lie contiguous and oldest-first. ordered()
+    returns that window as a view: updating a chart copies nothing.
+    """
+    __slots__ = ('_values', '_length', '_head')
+
+    def __init__(self, length: int):
+        self._values = np.zeros(2 * length, dtype=np.float32)
+        self._length = length
+        self._head = 0  # Slot of the oldest value, overwritten next
+
+    def append(self, value: float):
+        head = self._head
+        self._values[head] = self._values[head + self._length] = value
+        self._head = (head + 1) % self._length
+
+    def ordered(self) -> np.ndarray:
+        # The window ends with the newest value's mirrored copy; before the
+        # buffer first fills, the initial zeros stand in for older samples
+        return self._values[self._head:self._head + self._length]
 
 
 class ProcessManagerApp(QMainWindow):
@@ -57,17 +109,21 @@ class ProcessManagerApp(QMainWindow):
         self.setGeometry(100, 100, 1200, 800)
         self.setMinimumSize(QSize(800, 600))
         self.setStyleSheet(STYLE_SHEET)
+        configure_plotting()
 
-        self.cpu_history = deque([0] * CHART_HISTORY_LENGTH, maxlen=CHART_HISTORY_LENGTH)
-        self.ram_history = deque([0] * CHART_HISTORY_LENGTH, maxlen=CHART_HISTORY_LENGTH)
+        self.cpu_history = HistoryBuffer(CHART_HISTORY_LENGTH)
+        self.ram_history = HistoryBuffer(CHART_HISTORY_LENGTH)
         self.gpu_history = {}
+        # Chart pens, built once and shared by every curve of the same kind
+        self._cpu_pen = pg.mkPen('c')
+        self._ram_pen = pg.mkPen('m')
+        self._gpu_pen = pg.mkPen('g')
+        # Signals of the kill workers still running
+        self._kill_signals = set()
 
         self._setup_ui()
         self._setup_monitor_thread()
 
-        self.process_widgets = {}
-        self.table_needs_full_rebuild = True
-        
         log.info("Application UI initialized.")
         self.show()
 
@@ -97,7 +153,7 @@ class ProcessManagerApp(QMainWindow):
         self.cpu_total_label = QLabel("CPU Total Usage: 0.0%")
         self.cpu_total_progress = QProgressBar()
         self.cpu_cores_label = QLabel(f"Cores: {psutil.cpu_count(logical=False)} Physical, {psutil.cpu_count(logical=True)} Logical")
-        self.cpu_chart = self._create_plot_widget("CPU Usage History (%)")
+        self.cpu_chart, self.cpu_curve = self._create_plot_widget("CPU Usage History (%)", self._cpu_pen)
         cpu_layout.addWidget(self.cpu_total_label)
         cpu_layout.addWidget(self.cpu_total_progress)
         cpu_layout.addWidget(self.cpu_cores_label)
@@ -108,30 +164,44 @@ class ProcessManagerApp(QMainWindow):
         ram_layout = QVBoxLayout(ram_frame)
         self.ram_usage_label = QLabel("RAM Usage: 0.00 / 0.00 GB (0.0%)")
         self.ram_usage_progress = QProgressBar()
-        self.ram_chart = self._create_plot_widget("RAM Usage History (%)")
+        self.ram_chart, self.ram_curve = self._create_plot_widget("RAM Usage History (%)", self._ram_pen)
         ram_layout.addWidget(self.ram_usage_label)
         ram_layout.addWidget(self.ram_usage_progress)
         ram_layout.addWidget(self.ram_chart, stretch=1)
         layout.addWidget(ram_frame, 0, 1)
         self.tabs.addTab(tab, "Overview")
 
-    def _create_plot_widget(self, title: str) -> pg.PlotWidget:
-        # This method remains unchanged
+    def _create_plot_widget(self, title: str, pen: QPen) -> Tuple[pg.PlotWidget, pg.PlotDataItem]:
+        """
+        Creates a usage chart with a single curve. The curve is kept and fed
+        new data each tick rather than re-plotted, which would rebuild it.
+        """
         plot = pg.PlotWidget()
         plot.setTitle(title)
         plot.setLabel('left', 'Usage', units='%')
         plot.setLabel('bottom', 'Time (updates)')
         plot.showGrid(x=True, y=True)
         plot.setYRange(0, 100)
-        return plot
+        # Keep drawing cost flat as the history grows: draw at most a few
+        # points per pixel (keeping peaks), skip points outside the view and
+        # don't antialias the line.
+        plot.setDownsampling(auto=True, mode='peak')
+        plot.setClipToView(True)
+        plot.setAntialiasing(False)
+        curve = plot.plot(np.zeros(CHART_HISTORY_LENGTH, dtype=np.float32), pen=pen)
+        # Repaints without new data (window moves, overlapping widgets) reuse a cached pixmap
+        curve.curve.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
+        return plot, curve
 
     def _create_per_core_tab(self):
-        # This method remains unchanged
         tab = QWidget()
         self.per_core_layout = QGridLayout(tab)
         self.per_core_layout.setSpacing(10)
         self.per_core_widgets = []
         num_cores = psutil.cpu_count(logical=True)
+        # Usage each core currently shows, in tenths of a percent (-1 until
+        # first drawn)
+        self._per_core_tenths = np.full(num_cores, -1.0)
         cols = 4
         for i in range(num_cores):
             label = QLabel(f"Core {i}: 0.0%")
@@ -146,6 +216,9 @@ class ProcessManagerApp(QMainWindow):
         self.gpu_tab = QWidget()
         self.gpu_layout = QVBoxLayout(self.gpu_tab)
         self.gpu_widgets = {}
+        # UUIDs of the GPUs that have widgets, to skip the add/remove pass
+        # while the set of GPUs stays the same
+        self._last_gpu_uuid_set = frozenset()
         self.tabs.addTab(self.gpu_tab, "GPU")
 
     def _create_processes_tab(self):
@@ -158,7 +231,12 @@ class ProcessManagerApp(QMainWindow):
         top_bar_layout.addWidget(QLabel("Filter:"))
         self.search_input = QLineEdit()
         self.search_input.setPlaceholderText("Filter by name or PID...")
-        self.search_input.textChanged.connect(self._filter_processes)
+        # Re-filtering on every keystroke would touch every row per character
+        self._filter_timer = QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.setInterval(FILTER_DEBOUNCE_MS)
+        self._filter_timer.timeout.connect(self._filter_processes)
+        self.search_input.textChanged.connect(lambda _text: self._filter_timer.start())
         top_bar_layout.addWidget(self.search_input)
         
         # Add Export Button
@@ -168,14 +246,17 @@ class ProcessManagerApp(QMainWindow):
 
         layout.addLayout(top_bar_layout)
 
-        # Process Table (unchanged)
-        self.process_table = QTableWidget()
-        self.process_table.setColumnCount(7)
-        self.process_table.setHorizontalHeaderLabels(["PID", "Name", "CPU %", "RAM %", "GPU Mem (MB)", "Memory (MB)", "Command"])
-        self.process_table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.process_table.setSelectionMode(QTableWidget.SingleSelection)
-        self.process_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        # Process table: a view over the latest snapshot, sorted and filtered by a proxy
+        self.process_model = ProcessTableModel(self)
+        self.process_proxy = ProcessFilterProxyModel(self)
+        self.process_proxy.setSourceModel(self.process_model)
+        self.process_table = QTableView()
+        self.process_table.setModel(self.process_proxy)
+        self.process_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.process_table.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.process_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
         self.process_table.setSortingEnabled(True)
+        self.process_table.verticalHeader().setVisible(False)
         self.process_table.horizontalHeader().setSectionResizeMode(QHeaderView.Interactive)
         self.process_table.horizontalHeader().setStretchLastSection(True)
         self.process_table.setContextMenuPolicy(Qt.CustomContextMenu)
@@ -199,98 +280,118 @@ class ProcessManagerApp(QMainWindow):
             # User cancelled the dialog
             return
 
-        try:
-            with open(filePath, 'w', newline='', encoding='utf-8') as file:
-                writer = csv.writer(file)
-                
-                # Write header
-                header = [self.process_table.horizontalHeaderItem(i).text() for i in range(self.process_table.columnCount())]
-                writer.writerow(header)
-                
-                # Write data rows (only visible ones)
-                for row in range(self.process_table.rowCount()):
-                    if not self.process_table.isRowHidden(row):
-                        row_data = [self.process_table.item(row, col).text() for col in range(self.process_table.columnCount())]
-                        writer.writerow(row_data)
-
-            self.statusBar().showMessage(f"Successfully exported process list to {filePath}", 5000) # Message disappears after 5s
-            log.info(f"Process list exported to {filePath}")
-        except Exception as e:
-            log.error(f"Failed to export to CSV: {e}")
-            QMessageBox.critical(self, "Export Error", f"Could not write to file:\n{e}")
+        # Rows passing the filter, in view order. They are copied out here
+        # because the model keeps updating while the file is written.
+        proxy = self.process_proxy
+        rows = np.fromiter((proxy.mapToSource(proxy.index(row, 0)).row() for row in range(proxy.rowCount())),
+                           dtype=np.intp, count=proxy.rowCount())
+        runnable = ExportRunnable(filePath, self.process_model.snapshot_rows(rows))
+        runnable.signals.finished.connect(self._export_finished)
+        runnable.signals.failed.connect(self._export_failed)
+        # Keep the signals alive until the worker reports back
+        self._export_signals = runnable.signals
+        self.export_button.setEnabled(False)
+        QThreadPool.globalInstance().start(runnable)
+
+    def _export_finished(self, file_path: str):
+        self.export_button.setEnabled(True)
+        self._export_signals = None
+        self.statusBar().showMessage(f"Successfully exported process list to {file_path}", 5000) # Message disappears after 5s
+
+    def _export_failed(self, error: str):
+        self.export_button.setEnabled(True)
+        self._export_signals = None
+        QMessageBox.critical(self, "Export Error", f"Could not write to file:\n{error}")
 
     # All other methods (_setup_monitor_thread, update_ui, etc.) remain the same
     # as the previously corrected version. I'm including them here for completeness.
     
     def _setup_monitor_thread(self):
-        self.thread = QThread()
         self.monitor = SystemMonitor(refresh_interval=REFRESH_INTERVAL_MS / 1000.0)
-        self.monitor.moveToThread(self.thread)
-        self.thread.started.connect(self.monitor.run)
-        self.monitor.data_updated.connect(self.update_ui)
-        self.thread.finished.connect(self.thread.deleteLater)
-        self.thread.start()
-
-    @Slot(dict)
-    def update_ui(self, data: Dict[str, Any]):
+        self.monitor.start()
+        # The monitor only publishes its latest snapshot; polling it from a
+        # timer coalesces updates that arrive faster than the UI can draw.
+        self.poll_timer = QTimer(self)
+        self.poll_timer.setInterval(UI_POLL_INTERVAL_MS)
+        self.poll_timer.timeout.connect(self._poll_monitor)
+        self.poll_timer.start()
+
+    def _poll_monitor(self):
+        data = self.monitor.take_latest()
+        if data is not None:
+            self.update_ui(data)
+
+    def update_ui(self, data: TickData):
         self._update_overview_tab(data)
-        self._update_per_core_tab(data['cpu']['per_cpu_percent'])
-        self._update_gpu_tab(data['gpu'])
-        self._update_processes_tab(data['processes'])
+        self._update_per_core_tab(data.cpu_per_core)
+        self._update_gpu_tab(data.gpu)
+        self._update_processes_tab(data.processes, data.process_names, data.process_commands)
         self.statusBar().showMessage(f"Last updated: {time.strftime('%H:%M:%S')}")
 
-    def _update_overview_tab(self, data: Dict[str, Any]):
-        cpu_percent = data['cpu']['total_percent']
+    def _update_overview_tab(self, data: TickData):
+        cpu_percent = data.cpu_total
         self.cpu_total_label.setText(f"CPU Total Usage: {cpu_percent:.1f}%")
         self.cpu_total_progress.setValue(int(cpu_percent))
         self._set_progress_bar_style(self.cpu_total_progress, cpu_percent)
         self.cpu_history.append(cpu_percent)
-        self.cpu_chart.plot(list(self.cpu_history), clear=True, pen='c')
-        ram_data = data['ram']
-        total_ram_gb = ram_data['total'] / (1024**3)
-        used_ram_gb = ram_data['used'] / (1024**3)
-        ram_percent = ram_data['percent']
+        self.cpu_curve.setData(self.cpu_history.ordered())
+        total_ram_gb = data.ram_total / (1024**3)
+        used_ram_gb = data.ram_used / (1024**3)
+        ram_percent = data.ram_percent
         self.ram_usage_label.setText(f"RAM Usage: {used_ram_gb:.2f} / {total_ram_gb:.2f} GB ({ram_percent:.1f}%)")
         self.ram_usage_progress.setValue(int(ram_percent))
         self._set_progress_bar_style(self.ram_usage_progress, ram_percent)
         self.ram_history.append(ram_percent)
-        self.ram_chart.plot(list(self.ram_history), clear=True, pen='m')
+        self.ram_curve.setData(self.ram_history.ordered())
         
-    def _update_per_core_tab(self, per_cpu_data: List[float]):
-        for i, (label, progress) in enumerate(self.per_core_widgets):
-            if i < len(per_cpu_data):
-                percent = per_cpu_data[i]
-                label.setText(f"Core {i}: {percent:.1f}%")
-                progress.setValue(int(percent))
-                self._set_progress_bar_style(progress, percent)
+    def _update_per_core_tab(self, per_cpu_data: np.ndarray):
+        # Only cores whose displayed value (one decimal) changed are touched;
+        # on an idle machine that is usually few of them
+        count = min(len(per_cpu_data), len(self.per_core_widgets))
+        tenths = np.rint(per_cpu_data[:count] * 10)
+        changed = np.flatnonzero(tenths != self._per_core_tenths[:count])
+        if not len(changed):
+            return
+        self._per_core_tenths[:count] = tenths
+        tenths = tenths.tolist()
+        for i in changed.tolist():
+            percent = tenths[i] / 10
+            label, progress = self.per_core_widgets[i]
+            label.setText(f"Core {i}: {percent:.1f}%")
+            progress.setValue(int(percent))
+            self._set_progress_bar_style(progress, percent)
 
     def _update_gpu_tab(self, gpu_data: List[Dict[str, Any]]):
         if not gpu_data and not self.gpu_widgets:
             if self.gpu_layout.count() == 0:
                 self.gpu_layout.addWidget(QLabel("No compatible GPU (NVIDIA) found or required drivers are not installed."))
             return
-        current_gpus = {gpu['uuid'] for gpu in gpu_data}
-        for uuid in list(self.gpu_widgets.keys()):
-            if uuid not in current_gpus:
+        current_gpus = frozenset(gpu['uuid'] for gpu in gpu_data)
+        if current_gpus != self._last_gpu_uuid_set:
+            for uuid in self._last_gpu_uuid_set - current_gpus:
                 widgets = self.gpu_widgets.pop(uuid)
                 widgets['frame'].deleteLater()
+                del self.gpu_history[uuid]
+            for gpu in gpu_data:
+                uuid = gpu['uuid']
+                if uuid not in self.gpu_widgets:
+                    frame = QFrame()
+                    frame.setFrameShape(QFrame.StyledPanel)
+                    layout = QGridLayout(frame)
+                    name_label = QLabel(f"<b>{gpu['name']}</b>")
+                    mem_label, mem_progress = QLabel(), QProgressBar()
+                    util_label, util_progress = QLabel(), QProgressBar()
+                    chart, curve = self._create_plot_widget("GPU Usage History (%)", self._gpu_pen)
+                    layout.addWidget(name_label, 0, 0, 1, 2)
+                    layout.addWidget(util_label, 1, 0); layout.addWidget(util_progress, 1, 1)
+                    layout.addWidget(mem_label, 2, 0); layout.addWidget(mem_progress, 2, 1)
+                    layout.addWidget(chart, 0, 2, 3, 1)
+                    self.gpu_layout.addWidget(frame)
+                    self.gpu_widgets[uuid] = {'frame': frame, 'mem_label': mem_label, 'mem_progress': mem_progress, 'util_label': util_label, 'util_progress': util_progress, 'chart': chart, 'curve': curve}
+                    self.gpu_history[uuid] = HistoryBuffer(CHART_HISTORY_LENGTH)
+            self._last_gpu_uuid_set = current_gpus
         for gpu in gpu_data:
             uuid = gpu['uuid']
-            if uuid not in self.gpu_widgets:
-                frame = QFrame()
-                frame.setFrameShape(QFrame.StyledPanel)
-                layout = QGridLayout(frame)
-                name_label = QLabel(f"<b>{gpu['name']}</b>")
-                mem_label, mem_progress = QLabel(), QProgressBar()
-                util_label, util_progress = QLabel(), QProgressBar()
-                chart = self._create_plot_widget("GPU Usage History (%)")
-                layout.addWidget(name_label, 0, 0, 1, 2)
-                layout.addWidget(util_label, 1, 0); layout.addWidget(util_progress, 1, 1)
-                layout.addWidget(mem_label, 2, 0); layout.addWidget(mem_progress, 2, 1)
-                layout.addWidget(chart, 0, 2, 3, 1)
-                self.gpu_layout.addWidget(frame)
-                self.gpu_widgets[uuid] = {'frame': frame, 'mem_label': mem_label, 'mem_progress': mem_progress, 'util_label': util_label, 'util_progress': util_progress, 'chart': chart}
-                self.gpu_history[uuid] = deque([0] * CHART_HISTORY_LENGTH, maxlen=CHART_HISTORY_LENGTH)
             widgets = self.gpu_widgets[uuid]
             mem_used_gb, mem_total_gb, mem_percent = gpu['used_memory'] / (1024**3), gpu['total_memory'] / (1024**3), gpu['memory_percent']
             widgets['mem_label'].setText(f"Memory: {mem_used_gb:.2f}/{mem_total_gb:.2f} GB")
@@ -299,53 +400,24 @@ class ProcessManagerApp(QMainWindow):
             widgets['util_label'].setText(f"Utilization: {util_percent}%")
             widgets['util_progress'].setValue(util_percent); self._set_progress_bar_style(widgets['util_progress'], util_percent)
             self.gpu_history[uuid].append(util_percent)
-            widgets['chart'].plot(list(self.gpu_history[uuid]), clear=True, pen='g')
+            widgets['curve'].setData(self.gpu_history[uuid].ordered())
             
-    def _update_processes_tab(self, processes: List[Dict[str, Any]]):
-        self.process_table.setSortingEnabled(False)
-        new_pids = {p['pid'] for p in processes}
-        current_pids = set(self.process_widgets.keys())
-        for pid in current_pids - new_pids:
-            row_to_remove = -1
-            for row in range(self.process_table.rowCount()):
-                pid_item = self.process_table.item(row, 0)
-                if pid_item and int(pid_item.text()) == pid:
-                    row_to_remove = row
-                    break
-            if row_to_remove != -1: self.process_table.removeRow(row_to_remove)
-            if pid in self.process_widgets: del self.process_widgets[pid]
-        for proc_data in processes:
-            pid = proc_data['pid']
-            if pid in self.process_widgets:
-                row_items = self.process_widgets[pid]
-                row_items['cpu'].setText(f"{proc_data['cpu_percent']:.1f}")
-                row_items['ram'].setText(f"{proc_data['memory_percent']:.2f}")
-                row_items['gpu_mem'].setText(f"{proc_data['gpu_memory_bytes'] / (1024**2):.2f}")
-                row_items['mem_bytes'].setText(f"{proc_data['memory_bytes'] / (1024**2):.2f}")
-            else:
-                row_position = self.process_table.rowCount()
-                self.process_table.insertRow(row_position)
-                pid_item = QTableWidgetItem(); pid_item.setData(Qt.DisplayRole, pid)
-                items = {'pid': pid_item, 'name': QTableWidgetItem(proc_data['name']), 'cpu': QTableWidgetItem(f"{proc_data['cpu_percent']:.1f}"), 'ram': QTableWidgetItem(f"{proc_data['memory_percent']:.2f}"), 'gpu_mem': QTableWidgetItem(f"{proc_data['gpu_memory_bytes'] / (1024**2):.2f}"), 'mem_bytes': QTableWidgetItem(f"{proc_data['memory_bytes'] / (1024**2):.2f}"), 'command': QTableWidgetItem(proc_data['command'])}
-                for key in ['pid', 'cpu', 'ram', 'gpu_mem', 'mem_bytes']: items[key].setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-                for i, key in enumerate(['pid', 'name', 'cpu', 'ram', 'gpu_mem', 'mem_bytes', 'command']): self.process_table.setItem(row_position, i, items[key])
-                self.process_widgets[pid] = items
-        self.process_table.setSortingEnabled(True)
-        self._filter_processes()
+    def _update_processes_tab(self, processes: np.ndarray, names: List[str], commands: List[LazyCommand]):
+        # The model signals only the rows that changed, and Qt merges the
+        # resulting repaints; an unchanged snapshot repaints nothing
+        self.process_model.update(processes, names, commands)
 
     def _filter_processes(self):
-        filter_text = self.search_input.text().lower()
-        for row in range(self.process_table.rowCount()):
-            pid_item = self.process_table.item(row, 0)
-            name_item = self.process_table.item(row, 1)
-            if pid_item and name_item:
-                pid_match = filter_text in pid_item.text().lower()
-                name_match = filter_text in name_item.text().lower()
-                self.process_table.setRowHidden(row, not (pid_match or name_match))
+        self.process_proxy.set_filter_text(self.search_input.text())
+
+    def _selected_process_row(self) -> int:
+        """Returns the model row of the selected process, or -1 if none is selected."""
+        selected_rows = self.process_table.selectionModel().selectedRows()
+        if not selected_rows: return -1
+        return self.process_proxy.mapToSource(selected_rows[0]).row()
 
     def _show_process_context_menu(self, pos):
-        selected_items = self.process_table.selectedItems()
-        if not selected_items: return
+        if self._selected_process_row() < 0: return
         menu = QMenu()
         kill_action = QAction("Kill Process", self)
         kill_action.triggered.connect(self._kill_selected_process)
@@ -353,32 +425,41 @@ class ProcessManagerApp(QMainWindow):
         menu.exec(self.process_table.viewport().mapToGlobal(pos))
         
     def _kill_selected_process(self):
-        selected_items = self.process_table.selectedItems()
-        if not selected_items: return
-        row = selected_items[0].row()
-        pid = int(self.process_table.item(row, 0).text())
-        name = self.process_table.item(row, 1).text()
+        row = self._selected_process_row()
+        if row < 0: return
+        pid = self.process_model.pid_at(row)
+        name = self.process_model.name_at(row)
         reply = QMessageBox.question(self, 'Confirm Kill', f"Are you sure you want to terminate process '{name}' (PID: {pid})?", QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
         if reply == QMessageBox.Yes:
-            try:
-                p = psutil.Process(pid)
-                p.terminate()
-                log.info(f"Attempted to terminate process {name} (PID: {pid}).")
-                QMessageBox.information(self, "Success", f"Termination signal sent to '{name}'.")
-            except psutil.NoSuchProcess:
-                log.warning(f"Process {pid} no longer exists.")
-                QMessageBox.warning(self, "Error", "Process no longer exists.")
-            except psutil.AccessDenied:
-                log.error(f"Access denied to terminate process {pid}.")
-                QMessageBox.critical(self, "Error", "Access denied. Try running as administrator.")
+            runnable = KillRunnable(pid, name)
+            runnable.signals.finished.connect(self._kill_finished)
+            runnable.signals.failed.connect(self._kill_failed)
+            # Keep the signals alive until the worker reports back
+            self._kill_signals.add(runnable.signals)
+            QThreadPool.globalInstance().start(runnable)
+
+    def _kill_finished(self, name: str):
+        self._kill_signals.discard(self.sender())
+        self.monitor.request_refresh()
+        QMessageBox.information(self, "Success", f"Termination signal sent to '{name}'.")
+
+    def _kill_failed(self, error: str):
+        self._kill_signals.discard(self.sender())
+        QMessageBox.critical(self, "Error", error)
 
     def _set_progress_bar_style(self, pbar: QProgressBar, value: float):
-        if value > HIGH_USAGE_THRESHOLD: pbar.setStyleSheet(HIGH_USAGE_STYLE)
-        else: pbar.setStyleSheet(NORMAL_USAGE_STYLE)
+        # The colours come from the window's style sheet; the bar is only
+        # re-polished when it crosses the threshold, instead of re-parsing a
+        # style sheet of its own on every update
+        state = "high" if value > HIGH_USAGE_THRESHOLD else "normal"
+        if pbar.property(USAGE_PROPERTY) != state:
+            pbar.setProperty(USAGE_PROPERTY, state)
+            style = pbar.style()
+            style.unpolish(pbar)
+            style.polish(pbar)
 
     def closeEvent(self, event):
         log.info("Close event triggered. Shutting down monitor thread.")
-        self.monitor.stop()
-        self.thread.quit()
-        self.thread.wait(2000)
+        self.poll_timer.stop()
+        self.monitor.stop(timeout=2.0)
         event.accept()
@@ -1,17 +1,28 @@
+import atexit
 import logging
-from logging.handlers import RotatingFileHandler
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 import sys
 
+# Writes queued log records to the file and console on its own thread
+_log_listener = None
+
 def setup_logging():
     """
     Configures a rotating file logger for the application.
+    Records are only queued on the calling thread; a background listener
+    does the actual writes, so logging never blocks the UI or monitor
+    thread on disk I/O.
     """
+    global _log_listener
     logger = logging.getLogger("ProcessManager")
     logger.setLevel(logging.INFO)
 
     # Prevent adding multiple handlers if this function is called more than once
     if logger.hasHandlers():
         logger.handlers.clear()
+    if _log_listener is not None:
+        _log_listener.stop()
 
     # Create a rotating file handler
     file_handler = RotatingFileHandler(
@@ -21,16 +32,28 @@ def setup_logging():
         "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
     )
     file_handler.setFormatter(file_formatter)
-    logger.addHandler(file_handler)
 
     # Create a console handler for critical errors
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(logging.WARNING)
     console_formatter = logging.Formatter("%(levelname)s: %(message)s")
     console_handler.setFormatter(console_formatter)
-    logger.addHandler(console_handler)
+
+    log_queue = queue.Queue(-1)
+    logger.addHandler(QueueHandler(log_queue))
+    _log_listener = QueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+    _log_listener.start()
 
     return logger
 
+def _stop_logging():
+    """Writes out the records still queued and closes the log handlers."""
+    if _log_listener is not None:
+        _log_listener.stop()
+        for handler in _log_listener.handlers:
+            handler.close()
+
+atexit.register(_stop_logging)
+
 # Create a logger instance to be used across the application
 log = setup_logging()
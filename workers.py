@@ -0,0 +1,81 @@
+import csv
+
+import psutil
+from PySide6.QtCore import QObject, QRunnable, Signal
+
+from process_model import PROCESS_COLUMNS, format_process_columns
+from process_scanner import ProcessSnapshot
+from utils import log
+
+# Rows formatted and written per batch when exporting to CSV
+CSV_EXPORT_CHUNK_ROWS = 4096
+
+
+class WorkerSignals(QObject):
+    """
+    Signals of a QRunnable, which can't define its own. Created on the UI
+    thread, so connected slots run there.
+    """
+    finished = Signal(str)
+    failed = Signal(str)
+
+
+class ExportRunnable(QRunnable):
+    """
+    Writes a snapshot of the process table to a CSV file on a QThreadPool
+    thread. Emits `finished` with the file path, or `failed` with the error.
+    """
+
+    def __init__(self, file_path: str, snapshot: ProcessSnapshot):
+        super().__init__()
+        self.file_path = file_path
+        self.snapshot = snapshot
+        self.signals = WorkerSignals()
+
+    def run(self):
+        processes, names, commands = self.snapshot
+        try:
+            with open(self.file_path, 'w', newline='', encoding='utf-8') as file:
+                writer = csv.writer(file)
+                writer.writerow(PROCESS_COLUMNS)
+                # Formatted and written a chunk at a time, so a large table
+                # never sits in memory as text all at once
+                for start in range(0, len(processes), CSV_EXPORT_CHUNK_ROWS):
+                    end = start + CSV_EXPORT_CHUNK_ROWS
+                    writer.writerows(zip(*format_process_columns(
+                        processes[start:end], names[start:end], commands[start:end])))
+                    file.flush()
+        except Exception as e:
+            log.error(f"Failed to export to CSV: {e}")
+            self.signals.failed.emit(str(e))
+            return
+        log.info(f"Process list exported to {self.file_path}")
+        self.signals.finished.emit(self.file_path)
+
+
+class KillRunnable(QRunnable):
+    """
+    Sends the terminate signal to a process on a QThreadPool thread, as
+    psutil can block for a while on stuck processes or on Windows. Emits
+    `finished` with the process name, or `failed` with a message for the user.
+    """
+
+    def __init__(self, pid: int, name: str):
+        super().__init__()
+        self.pid = pid
+        self.name = name
+        self.signals = WorkerSignals()
+
+    def run(self):
+        try:
+            psutil.Process(self.pid).terminate()
+        except psutil.NoSuchProcess:
+            log.warning(f"Process {self.pid} no longer exists.")
+            self.signals.failed.emit("Process no longer exists.")
+            return
+        except psutil.AccessDenied:
+            log.error(f"Access denied to terminate process {self.pid}.")
+            self.signals.failed.emit("Access denied. Try running as administrator.")
+            return
+        log.info(f"Attempted to terminate process {self.name} (PID: {self.pid}).")
+        self.signals.finished.emit(self.name)